@@ -0,0 +1,220 @@
+"""
+Benchmark the OpenShock integration against a local mock of the API.
+
+Run with `scripts/benchmark`, see `scripts/benchmark --help` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from homeassistant import loader
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_state_change_event
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.openshock.const import (
+    CONF_HUBS,
+    CONF_PUSH,
+    CONF_UPDATE_INTERVAL,
+    DOMAIN,
+)
+
+from .mock_server import MockOpenShockServer
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, EventStateChangedData, HomeAssistant
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | None]:
+    """Return p50/p95/p99 of samples in milliseconds."""
+    if len(samples) < 2:  # noqa: PLR2004
+        value = samples[0] * 1000 if samples else None
+        return {"p50": value, "p95": value, "p99": value}
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+async def _async_press(hass: HomeAssistant, entity_ids: list[str]) -> float:
+    """Press buttons in one service call and return how long it took."""
+    started = time.monotonic()
+    await hass.services.async_call(
+        "button", "press", {"entity_id": entity_ids}, blocking=True
+    )
+    return time.monotonic() - started
+
+
+async def _async_push_latency(hass: HomeAssistant, button: str, sensor: str) -> float:
+    """Press a button and return how long until its pushed log reached the sensor."""
+    changed = hass.loop.create_future()
+
+    def _changed(_: Event[EventStateChangedData]) -> None:
+        if not changed.done():
+            changed.set_result(time.monotonic())
+
+    unsubscribe = async_track_state_change_event(hass, sensor, _changed)
+    try:
+        started = time.monotonic()
+        await _async_press(hass, [button])
+        return await asyncio.wait_for(changed, timeout=5) - started
+    finally:
+        unsubscribe()
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the results."""
+    server = MockOpenShockServer(
+        hubs=args.hubs,
+        shockers_per_hub=args.shockers,
+        latency=args.latency / 1000,
+        error_rate=args.error_rate,
+    )
+    await server.start()
+    results: dict[str, Any] = {
+        "hubs": args.hubs,
+        "shockers": server.shocker_count,
+        "latency_ms": args.latency,
+        "error_rate": args.error_rate,
+    }
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                version=2,
+                title="Benchmark",
+                data={
+                    CONF_HOST: server.url,
+                    CONF_API_KEY: "benchmark",
+                    CONF_HUBS: None,
+                    CONF_UPDATE_INTERVAL: 30,
+                },
+                options={CONF_PUSH: args.push},
+            )
+            entry.add_to_hass(hass)
+
+            # Setup time, requests and memory of a cold start.
+            tracemalloc.start()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            started = time.monotonic()
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            results["setup_s"] = time.monotonic() - started
+            results["memory_per_shocker_kib"] = (
+                (tracemalloc.get_traced_memory()[0] - memory_before)
+                / 1024
+                / server.shocker_count
+            )
+            tracemalloc.stop()
+            # Includes the first import of the shocker logs.
+            await hass.async_block_till_done(wait_background_tasks=True)
+            results["setup_requests"] = sum(server.requests.values())
+
+            # Requests per refresh cycle of the coordinators. Reads are
+            # expired first, as they would be between two real polls.
+            server.requests.clear()
+            for _ in range(args.cycles):
+                entry.runtime_data.client.expire_reads()
+                await entry.runtime_data.coordinator.async_refresh()
+            results["requests_per_poll_cycle"] = (
+                sum(server.requests.values()) / args.cycles
+            )
+
+            buttons = [
+                registry_entry.entity_id
+                for registry_entry in er.async_entries_for_config_entry(
+                    er.async_get(hass), entry.entry_id
+                )
+                if registry_entry.domain == "button"
+                and registry_entry.unique_id.endswith("-vibrate")
+            ]
+
+            # Latency of single presses, one after the other.
+            latencies = [
+                await _async_press(hass, [buttons[press % len(buttons)]])
+                for press in range(args.presses)
+            ]
+            results["control_latency_ms"] = _percentiles(latencies)
+
+            # One service call pressing every shocker at once.
+            server.controls.clear()
+            results["fan_out_latency_ms"] = await _async_press(hass, buttons) * 1000
+            results["fan_out_requests"] = len(server.controls)
+
+            # The same through the control service, one request per entry.
+            server.controls.clear()
+            started = time.monotonic()
+            await hass.services.async_call(
+                DOMAIN,
+                "control",
+                {"entity_id": buttons, "type": "vibrate"},
+                blocking=True,
+            )
+            results["control_service_latency_ms"] = (time.monotonic() - started) * 1000
+            results["control_service_requests"] = len(server.controls)
+
+            if args.push:
+                # Time from a press until the log pushed over the stand-in
+                # user hub updates the last control sensor.
+                sensor = next(
+                    registry_entry
+                    for registry_entry in er.async_entries_for_config_entry(
+                        er.async_get(hass), entry.entry_id
+                    )
+                    if registry_entry.unique_id.endswith("-last_control")
+                )
+                button = er.async_get(hass).async_get_entity_id(
+                    "button",
+                    DOMAIN,
+                    sensor.unique_id.removesuffix("last_control") + "vibrate",
+                )
+                results["push_log_latency_ms"] = (
+                    await _async_push_latency(hass, button, sensor.entity_id) * 1000
+                )
+
+            results["requests"] = dict(server.requests)
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_stop(force=True)
+
+    await server.stop()
+    return results
+
+
+def main() -> None:
+    """Parse the arguments, run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hubs", type=int, default=1, help="hubs on the account")
+    parser.add_argument("--shockers", type=int, default=10, help="shockers per hub")
+    parser.add_argument(
+        "--latency", type=float, default=50, help="server latency in ms"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="share of requests failing"
+    )
+    parser.add_argument("--cycles", type=int, default=10, help="poll cycles")
+    parser.add_argument("--presses", type=int, default=50, help="button presses")
+    parser.add_argument(
+        "--push", action="store_true", help="enable push over the user hub"
+    )
+    results = asyncio.run(async_run(parser.parse_args()))
+    print(json.dumps(results, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Local stand-in for the OpenShock API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import uuid
+from collections import Counter, defaultdict
+from datetime import UTC, datetime
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+# SignalR JSON hub protocol, as spoken by the user hub.
+RECORD_SEPARATOR = "\x1e"
+
+
+class MockOpenShockServer:
+    """Local stand-in for the OpenShock API with configurable behaviour."""
+
+    def __init__(
+        self,
+        hubs: int = 1,
+        shockers_per_hub: int = 10,
+        latency: float = 0.05,
+        error_rate: float = 0.0,
+    ) -> None:
+        """
+        Local stand-in for the OpenShock API with configurable behaviour.
+
+        Every response is delayed by `latency` seconds and fails with a 500 at
+        the given `error_rate`.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests: Counter[str] = Counter()
+        self.controls: list[list[dict[str, Any]]] = []
+        self.logs: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.hubs = [
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"Hub {hub}",
+                "createdOn": "2024-01-01T00:00:00Z",
+                "shockers": [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "name": f"Shocker {hub}.{shocker}",
+                        "rfId": shocker,
+                        "model": "CaiXianlin",
+                        "isPaused": False,
+                        "createdOn": "2024-01-01T00:00:00Z",
+                    }
+                    for shocker in range(shockers_per_hub)
+                ],
+            }
+            for hub in range(hubs)
+        ]
+        self._runner: web.AppRunner | None = None
+        self._sockets: set[web.WebSocketResponse] = set()
+        self.url = ""
+
+    @property
+    def shocker_count(self) -> int:
+        """Return the number of shockers across all hubs."""
+        return sum(len(hub["shockers"]) for hub in self.hubs)
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/1/tokens/self", self._token)
+        app.router.add_get("/1/devices", self._devices)
+        app.router.add_get("/1/devices/{device}", self._device)
+        app.router.add_get("/1/devices/{device}/shockers", self._device_shockers)
+        app.router.add_get("/1/shockers/own", self._own_shockers)
+        app.router.add_get("/1/shockers/{shocker}", self._shocker)
+        app.router.add_get("/1/shockers/{shocker}/logs", self._shocker_logs)
+        app.router.add_post("/2/shockers/control", self._control)
+        app.router.add_get("/1/hubs/user", self._user_hub)
+        app.router.add_route("HEAD", "/", self._root)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        for websocket in list(self._sockets):
+            await websocket.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Any,
+    ) -> web.StreamResponse:
+        """Count, delay and randomly fail requests."""
+        route = request.match_info.route.resource
+        self.requests[
+            f"{request.method} {route.canonical if route else request.path}"
+        ] += 1
+        await asyncio.sleep(self.latency)
+        if request.method != "HEAD" and random.random() < self.error_rate:  # noqa: S311
+            return web.json_response({"message": "Injected error"}, status=500)
+        return await handler(request)
+
+    async def push(self, target: str, arguments: list[Any]) -> None:
+        """Send an invocation to every client connected to the user hub."""
+        message = json.dumps({"type": 1, "target": target, "arguments": arguments})
+        for websocket in list(self._sockets):
+            await websocket.send_str(message + RECORD_SEPARATOR)
+
+    async def _user_hub(self, request: web.Request) -> web.WebSocketResponse:
+        """Speak enough of the SignalR hub protocol to push events."""
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        async for message in websocket:
+            if message.type != WSMsgType.TEXT:
+                break
+            for record in message.data.split(RECORD_SEPARATOR):
+                if not record:
+                    continue
+                payload = json.loads(record)
+                if "protocol" in payload:
+                    # Handshake, answered with an empty object.
+                    await websocket.send_str("{}" + RECORD_SEPARATOR)
+                    self._sockets.add(websocket)
+                    await self.push(
+                        "DeviceStatus",
+                        [
+                            [
+                                {
+                                    "device": hub["id"],
+                                    "online": True,
+                                    "firmwareVersion": "1.0.0",
+                                }
+                                for hub in self.hubs
+                            ]
+                        ],
+                    )
+                elif payload.get("type") == 6:  # noqa: PLR2004
+                    await websocket.send_str(message.data)
+        self._sockets.discard(websocket)
+        return websocket
+
+    async def _root(self, _: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _token(self, _: web.Request) -> web.Response:
+        return web.json_response({"id": str(uuid.uuid4()), "name": "Benchmark"})
+
+    async def _devices(self, _: web.Request) -> web.Response:
+        return _data([_without_shockers(hub) for hub in self.hubs])
+
+    async def _device(self, request: web.Request) -> web.Response:
+        hub = self._hub(request.match_info["device"])
+        return _data(_without_shockers(hub))
+
+    async def _device_shockers(self, request: web.Request) -> web.Response:
+        return _data(self._hub(request.match_info["device"])["shockers"])
+
+    async def _own_shockers(self, _: web.Request) -> web.Response:
+        return _data(self.hubs)
+
+    async def _shocker(self, request: web.Request) -> web.Response:
+        for hub in self.hubs:
+            for shocker in hub["shockers"]:
+                if shocker["id"] == request.match_info["shocker"]:
+                    return _data({**shocker, "device": hub["id"]})
+        raise web.HTTPNotFound
+
+    async def _shocker_logs(self, request: web.Request) -> web.Response:
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 100))
+        logs = self.logs[request.match_info["shocker"]]
+        return _data(logs[::-1][offset : offset + limit])
+
+    async def _control(self, request: web.Request) -> web.Response:
+        shocks = (await request.json())["shocks"]
+        self.controls.append(shocks)
+        created = datetime.now(UTC).isoformat()
+        for shock in shocks:
+            self.logs[shock["id"]].append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "createdOn": created,
+                    "type": shock["type"],
+                    "intensity": shock["intensity"],
+                    "duration": shock["duration"],
+                }
+            )
+        await self.push(
+            "Log",
+            [
+                {"id": str(uuid.uuid4()), "name": "Benchmark"},
+                [
+                    {
+                        "shocker": {"id": shock["id"]},
+                        "type": shock["type"],
+                        "intensity": shock["intensity"],
+                        "duration": shock["duration"],
+                        "executedAt": created,
+                    }
+                    for shock in shocks
+                ],
+            ],
+        )
+        return _data("Successfully sent control messages")
+
+    def _hub(self, hub_id: str) -> dict[str, Any]:
+        for hub in self.hubs:
+            if hub["id"] == hub_id:
+                return hub
+        raise web.HTTPNotFound
+
+
+def _data(data: Any) -> web.Response:
+    """Wrap data in the API's response envelope."""
+    return web.json_response({"message": "", "data": data})
+
+
+def _without_shockers(hub: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in hub.items() if key != "shockers"}
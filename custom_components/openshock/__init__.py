@@ -7,23 +7,77 @@ https://github.com/veronoicc/openshock-homeassistabt
 
 from __future__ import annotations
 
+import time
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_API_KEY, CONF_HOST, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import aiohttp
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_HOST,
+    EVENT_HOMEASSISTANT_CLOSE,
+    Platform,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.loader import async_get_loaded_integration
+from homeassistant.util.ssl import get_default_context
 
-from .api import OpenShockApiClient
-from .const import CONF_HUB, CONF_UPDATE_INTERVAL
-from .coordinator import OpenShockDataUpdateCoordinator
+from .api import OpenShockApiClient, OpenShockFailoverApiClient
+from .const import (
+    CONF_CONNECTION_LIMIT,
+    CONF_CONTROL_HEDGE,
+    CONF_CONTROL_WINDOW,
+    CONF_HUB,
+    CONF_HUBS,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_LOCAL_HOST,
+    CONF_PUSH,
+    CONF_READ_RETRIES,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_CONTROL_HEDGE,
+    DEFAULT_CONTROL_WINDOW,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_PUSH,
+    DEFAULT_READ_RETRIES,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    LOG_IMPORT_INTERVAL,
+    LOGGER,
+    STORAGE_VERSION,
+)
+from .coordinator import OpenShockAccountDataUpdateCoordinator
 from .data import OpenShockData
+from .history import OpenShockLogImporter
+from .pattern import OpenShockPatternPlayer
+from .push import OpenShockPushClient
+from .services import async_setup_services
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from collections.abc import Awaitable
+
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import OpenShockConfigEntry
 
-PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.NUMBER, Platform.BINARY_SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.BUTTON,
+    Platform.NUMBER,
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services of this integration."""
+    async_setup_services(hass)
+    return True
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
@@ -32,36 +86,169 @@ async def async_setup_entry(
     entry: OpenShockConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    entry.runtime_data = OpenShockData(
-        client=OpenShockApiClient(
+    session = _async_create_session(hass, entry)
+    control_window = (
+        entry.options.get(CONF_CONTROL_WINDOW, DEFAULT_CONTROL_WINDOW) / 1000
+    )
+    read_retries = int(entry.options.get(CONF_READ_RETRIES, DEFAULT_READ_RETRIES))
+    hedge_control = entry.options.get(CONF_CONTROL_HEDGE, DEFAULT_CONTROL_HEDGE)
+    client = (
+        OpenShockFailoverApiClient(
             host=entry.data[CONF_HOST],
+            local_host=entry.data[CONF_LOCAL_HOST],
             token=entry.data[CONF_API_KEY],
-            session=async_get_clientsession(hass),
-        ),
-        integration=async_get_loaded_integration(hass, entry.domain),
+            session=session,
+            control_window=control_window,
+            read_retries=read_retries,
+            hedge_control=hedge_control,
+        )
+        if entry.data.get(CONF_LOCAL_HOST)
+        else OpenShockApiClient(
+            host=entry.data[CONF_HOST],
+            token=entry.data[CONF_API_KEY],
+            session=session,
+            control_window=control_window,
+            read_retries=read_retries,
+            hedge_control=hedge_control,
+        )
+    )
+
+    entry.async_create_background_task(
+        hass, client.async_warm_up(), "openshock warm up"
     )
 
-    hub = await entry.runtime_data.client.get_device(entry.data[CONF_HUB])
+    # A single coordinator polls every hub and shocker of the account in one
+    # request and fans the result out to the per-hub and per-shocker
+    # coordinators the entities use.
+    coordinator = OpenShockAccountDataUpdateCoordinator(
+        hass=hass,
+        update_interval=entry.data[CONF_UPDATE_INTERVAL],
+        hub_ids=entry.data[CONF_HUBS],
+    )
+    entry.runtime_data = OpenShockData(
+        client=client,
+        integration=async_get_loaded_integration(hass, entry.domain),
+        coordinator=coordinator,
+        patterns=OpenShockPatternPlayer(client),
+    )
+    entry.async_on_unload(entry.runtime_data.patterns.cancel)
 
-    for shocker in await entry.runtime_data.client.get_shockers_by_device(hub["id"]):
-        coordinator = OpenShockDataUpdateCoordinator(
-            hass=hass,
-            update_interval=entry.data[CONF_UPDATE_INTERVAL],
-            shocker=shocker,
-            hub=hub,
+    timings = entry.runtime_data.setup_timings
+    started = time.monotonic()
+    # Entities are created from the last known topology when there is one, the
+    # API is then only queried in the background.
+    snapshot = await _async_timed(
+        timings, "snapshot", coordinator.async_load_snapshot()
+    )
+    if not snapshot:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await _async_timed(
+            timings, "fetch", coordinator.async_config_entry_first_refresh()
         )
-        entry.runtime_data.coordinators[shocker["id"]] = coordinator
+        coordinator.async_save_snapshot()
+
+    coordinator.async_update_topology()
+    entry.async_on_unload(coordinator.async_add_listener(coordinator.async_update_hubs))
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    for coordinator in entry.runtime_data.coordinators.values():
-        await coordinator.async_config_entry_first_refresh()
+    if entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+        push = OpenShockPushClient(
+            host=entry.data[CONF_HOST],
+            token=entry.data[CONF_API_KEY],
+            session=session,
+            on_event=coordinator.async_handle_push_event,
+            on_connection_change=coordinator.async_set_push_connected,
+        )
+        entry.async_create_background_task(hass, push.run(), "openshock push")
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await _async_timed(
+        timings,
+        "platforms",
+        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS),
+    )
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    if snapshot:
+        # Hubs and shockers added or removed since the snapshot are
+        # reconciled when the refresh completes.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "openshock revalidate"
+        )
+
+    # The control logs are imported as long-term statistics in the background.
+    importer = OpenShockLogImporter(hass, entry)
+    entry.async_create_background_task(
+        hass, importer.async_import(), "openshock log import"
+    )
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            importer.async_import,
+            timedelta(**LOG_IMPORT_INTERVAL),
+            name="openshock log import",
+            cancel_on_shutdown=True,
+        )
+    )
+
+    timings["total"] = time.monotonic() - started
+    LOGGER.debug(
+        "Set up %s with %s hubs and %s shockers in %.3fs (%s)",
+        entry.title,
+        len(coordinator.hubs),
+        len(entry.runtime_data.coordinators),
+        timings["total"],
+        ", ".join(f"{step}: {duration:.3f}s" for step, duration in timings.items()),
+    )
+
     return True
 
 
+async def _async_timed[T](
+    timings: dict[str, float],
+    step: str,
+    awaitable: Awaitable[T],
+) -> T:
+    """Await and record how long a setup step took."""
+    started = time.monotonic()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = time.monotonic() - started
+
+
+def _async_create_session(
+    hass: HomeAssistant,
+    entry: OpenShockConfigEntry,
+) -> aiohttp.ClientSession:
+    """
+    Create a session dedicated to this entry.
+
+    Its own connection pool keeps control commands from queueing behind other
+    integrations, and idle connections are kept alive between polls.
+    """
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=int(
+                entry.options.get(CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT)
+            ),
+            keepalive_timeout=entry.options.get(
+                CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT
+            ),
+            ttl_dns_cache=DNS_CACHE_TTL,
+            ssl=get_default_context(),
+        ),
+        headers={"User-Agent": SERVER_SOFTWARE},
+    )
+
+    async def _async_close_session(_: Event | None = None) -> None:
+        await session.close()
+
+    entry.async_on_unload(_async_close_session)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    )
+    return session
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: OpenShockConfigEntry,
@@ -70,10 +257,30 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_migrate_entry(
+    hass: HomeAssistant,
+    entry: OpenShockConfigEntry,
+) -> bool:
+    """Migrate an entry bound to a single hub to the list of hubs."""
+    if entry.version == 1:
+        data = {key: value for key, value in entry.data.items() if key != CONF_HUB}
+        data[CONF_HUBS] = [entry.data[CONF_HUB]]
+        hass.config_entries.async_update_entry(entry, data=data, version=2)
+    return True
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: OpenShockConfigEntry,
+) -> None:
+    """Remove the stored snapshot and log cursors of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await OpenShockLogImporter(hass, entry).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: OpenShockConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
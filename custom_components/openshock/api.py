@@ -2,13 +2,51 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
+import random
 import socket
-from typing import Any
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum, StrEnum
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
 
-from custom_components.openshock.const import LOGGER
+from custom_components.openshock.const import (
+    BREAKER_RESET,
+    BREAKER_THRESHOLD,
+    CONTROL_HEDGE_DELAY,
+    CONTROL_TIMEOUT,
+    DEFAULT_READ_RETRIES,
+    EMERGENCY_STOP_ATTEMPTS,
+    EMERGENCY_STOP_HEDGE_DELAY,
+    LOCAL_RETRY_INTERVAL,
+    LOCAL_TIMEOUT,
+    LOGGER,
+    MIN_DURATION,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_RATE,
+    READ_CACHE_SIZE,
+    READ_CACHE_TTL,
+    READ_TIMEOUT,
+    RETRY_BACKOFF,
+)
+from custom_components.openshock.metrics import OpenShockApiMetrics, endpoint_name
+from custom_components.openshock.models import OpenShockHub
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator, Mapping
+
+
+CONTROL_PATH = "/2/shockers/control"
+CONTROL_ENDPOINT = endpoint_name("post", CONTROL_PATH)
 
 
 class OpenShockApiClientError(Exception):
@@ -27,6 +65,28 @@ class OpenShockApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class OpenShockApiClientRateLimitError(
+    OpenShockApiClientCommunicationError,
+):
+    """Exception to indicate the API rate limit was hit."""
+
+    def __init__(self, msg: str, retry_after: float | None = None) -> None:
+        """Exception to indicate the API rate limit was hit."""
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+class OpenShockApiClientCircuitOpenError(
+    OpenShockApiClientCommunicationError,
+):
+    """Exception to indicate requests are not sent while the API is down."""
+
+    def __init__(self, msg: str, retry_after: float) -> None:
+        """Exception to indicate requests are not sent while the API is down."""
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     """Verify that the response is valid."""
     if response.status in (401, 403):
@@ -34,22 +94,398 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
         raise OpenShockApiClientAuthenticationError(
             msg,
         )
-    response.raise_for_status()
+    if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+        msg = "Rate limit exceeded"
+        retry_after = response.headers.get("Retry-After", "")
+        raise OpenShockApiClientRateLimitError(
+            msg,
+            float(retry_after) if retry_after.isdigit() else None,
+        )
+    # Only server errors are transient, they are retried and count towards
+    # opening the circuit.
+    if response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        msg = f"Server error {response.status} {response.reason}"
+        raise OpenShockApiClientCommunicationError(msg)
+    if response.status >= HTTPStatus.BAD_REQUEST:
+        msg = f"Request rejected with {response.status} {response.reason}"
+        raise OpenShockApiClientError(msg)
+
+
+class OpenShockCircuitState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class OpenShockCircuitBreaker:
+    """Fail fast while the API is down and probe it to notice its recovery."""
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        reset: float = BREAKER_RESET,
+    ) -> None:
+        """
+        Fail fast while the API is down and probe it to notice its recovery.
+
+        After `threshold` consecutive communication errors the circuit opens
+        and requests fail without being sent. After `reset` seconds a single
+        request is let through as a probe, its outcome closes or reopens the
+        circuit.
+        """
+        self._threshold = threshold
+        self._reset = reset
+        self._opened_at = 0.0
+        self._probing = False
+        self.state = OpenShockCircuitState.CLOSED
+        self.failures = 0
+        self.last_error: str | None = None
+
+    @contextmanager
+    def guard(self, *, bypass: bool = False) -> Iterator[None]:
+        """Let a request through if the circuit allows it and record its outcome."""
+        probe = False
+        if not bypass:
+            probe = self._check()
+        try:
+            yield
+        except OpenShockApiClientRateLimitError:
+            # The API answered, it is not down.
+            raise
+        except OpenShockApiClientCommunicationError as exception:
+            self._record_failure(exception)
+            raise
+        else:
+            self._record_success()
+        finally:
+            if probe:
+                self._probing = False
+
+    def _check(self) -> bool:
+        """Raise while the circuit is open, return whether this is a probe."""
+        if self.state == OpenShockCircuitState.CLOSED:
+            return False
+        retry_after = self._opened_at + self._reset - time.monotonic()
+        if retry_after > 0 or self._probing:
+            msg = f"API unavailable, not sending requests - {self.last_error}"
+            raise OpenShockApiClientCircuitOpenError(msg, max(retry_after, 0))
+        self.state = OpenShockCircuitState.HALF_OPEN
+        self._probing = True
+        return True
+
+    def _record_success(self) -> None:
+        """Close the circuit."""
+        if self.state != OpenShockCircuitState.CLOSED:
+            LOGGER.info("OpenShock API is available again")
+        self.state = OpenShockCircuitState.CLOSED
+        self.failures = 0
+
+    def _record_failure(self, exception: Exception) -> None:
+        """Open the circuit after too many consecutive failures."""
+        self.failures += 1
+        self.last_error = str(exception)
+        if self.state == OpenShockCircuitState.HALF_OPEN or (
+            self.state == OpenShockCircuitState.CLOSED
+            and self.failures >= self._threshold
+        ):
+            if self.state == OpenShockCircuitState.CLOSED:
+                LOGGER.warning(
+                    "OpenShock API unavailable, pausing requests for %ss - %s",
+                    self._reset,
+                    exception,
+                )
+            self.state = OpenShockCircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+
+class OpenShockRequestPriority(IntEnum):
+    """Priority of a request, lower values are sent first."""
+
+    STOP = 0
+    CONTROL = 1
+    READ = 2
+
+
+class OpenShockRequestScheduler:
+    """Token bucket handing out request slots by priority."""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_RATE,
+        burst: int = RATE_LIMIT_BURST,
+    ) -> None:
+        """
+        Token bucket handing out request slots by priority.
+
+        The bucket refills at `rate` tokens per second up to `burst` tokens and
+        is tightened by the rate limit headers the API sends back. Stop
+        commands never wait, they are safety critical.
+        """
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    async def acquire(self, priority: OpenShockRequestPriority) -> None:
+        """Wait until a request with the given priority may be sent."""
+        if priority == OpenShockRequestPriority.STOP:
+            self.take()
+            return
+        if not self._waiters and self._try_take():
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._release_waiters()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._tokens += 1
+            raise
+
+    def take(self) -> None:
+        """
+        Take a token without waiting, the requests after it wait longer.
+
+        The bucket never goes into debt, so a long pattern does not hold up
+        the commands and polls after it.
+        """
+        self._refill()
+        self._tokens = max(self._tokens - 1, 0)
+
+    def update(self, response: aiohttp.ClientResponse) -> None:
+        """Tighten the bucket using the rate limit headers of a response."""
+        now = time.monotonic()
+        headers = response.headers
+        if (remaining := _header_float(headers, "X-RateLimit-Remaining")) is not None:
+            self._refill()
+            self._tokens = min(self._tokens, remaining)
+            if (
+                remaining <= 0
+                and (reset := _header_float(headers, "X-RateLimit-Reset")) is not None
+            ):
+                # Either a unix timestamp or a number of seconds.
+                delay = reset - time.time() if reset > 1e9 else reset  # noqa: PLR2004
+                self._blocked_until = max(self._blocked_until, now + delay)
+        if (
+            response.status == HTTPStatus.TOO_MANY_REQUESTS
+            and (retry_after := _header_float(headers, "Retry-After")) is not None
+        ):
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _try_take(self) -> bool:
+        """Take a token if one is available."""
+        self._refill()
+        if time.monotonic() < self._blocked_until or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _release_waiters(self) -> None:
+        """Hand out tokens to waiters in priority order."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        if self._waiters:
+            delay = max(
+                self._blocked_until - time.monotonic(),
+                (1 - self._tokens) / self._rate,
+            )
+            self._wakeup = asyncio.get_running_loop().call_later(
+                delay, self._release_waiters
+            )
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    """Return a numeric header value, if present."""
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class OpenShockControlDispatcher:
+    """Coalesce control commands issued close together into one request."""
+
+    def __init__(
+        self,
+        send: Callable[[list[dict]], Awaitable[Any]],
+        window: float = 0,
+    ) -> None:
+        """
+        Coalesce control commands issued close together into one request.
+
+        Commands submitted within `window` seconds of the first pending one are
+        sent together. A window of 0 still batches everything submitted in the
+        same event loop iteration, such as one service call targeting several
+        buttons.
+        """
+        self._send = send
+        self._window = window
+        self._pending: list[tuple[list[dict], asyncio.Future]] = []
+        self._pending_shockers: set[str] = set()
+        self._flush_handle: asyncio.Handle | None = None
+        # Batches in flight and the shockers they command.
+        self._tasks: dict[asyncio.Task, frozenset[str]] = {}
+
+    async def submit(self, shocks: list[dict]) -> Any:
+        """Queue commands for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        # A shocker can only take one command per request, so a second command
+        # for the same shocker closes the current batch.
+        if any(shock["id"] in self._pending_shockers for shock in shocks):
+            self._flush()
+
+        future = loop.create_future()
+        self._pending.append((shocks, future))
+        self._pending_shockers.update(shock["id"] for shock in shocks)
+        if any(shock["type"] == "stop" for shock in shocks):
+            # Stop commands never wait for the window to close.
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = (
+                loop.call_later(self._window, self._flush)
+                if self._window > 0
+                else loop.call_soon(self._flush)
+            )
+        return await future
+
+    def drop(self, shocker_ids: set[str]) -> set[asyncio.Task]:
+        """
+        Drop the queued commands of shockers and return their batches in flight.
+
+        Callers whose commands were all dropped get an error, commands for
+        other shockers stay queued.
+        """
+        if self._pending_shockers & shocker_ids:
+            pending = []
+            for shocks, future in self._pending:
+                kept = [shock for shock in shocks if shock["id"] not in shocker_ids]
+                if kept:
+                    pending.append((kept, future))
+                elif not future.done():
+                    msg = "Superseded by an emergency stop"
+                    future.set_exception(OpenShockApiClientError(msg))
+            self._pending = pending
+            self._pending_shockers = {
+                shock["id"] for shocks, _ in pending for shock in shocks
+            }
+            if not pending and self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+        return {task for task, ids in self._tasks.items() if ids & shocker_ids}
+
+    def _flush(self) -> None:
+        """Send every pending command as one request."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        shocker_ids, self._pending_shockers = self._pending_shockers, set()
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send_batch(batch))
+        self._tasks[task] = frozenset(shocker_ids)
+        task.add_done_callback(self._tasks.pop)
+
+    async def _send_batch(self, batch: list[tuple[list[dict], asyncio.Future]]) -> None:
+        """Send a batch and hand the outcome to every caller in it."""
+        try:
+            result = await self._send(
+                [shock for shocks, _ in batch for shock in shocks]
+            )
+        except Exception as exception:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exception)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """A parsed response with the validators to revalidate it."""
+
+    etag: str | None
+    last_modified: str | None
+    data: Any
 
 
 class OpenShockApiClient:
     """OpenShock API Client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         host: str,
         token: str,
         session: aiohttp.ClientSession,
+        control_window: float = 0,
+        read_retries: int = DEFAULT_READ_RETRIES,
+        *,
+        hedge_control: bool = False,
     ) -> None:
         """OpenShock API Client."""
         self._host = host
         self._token = token
         self._session = session
+        self._control_url = f"{host}{CONTROL_PATH}"
+        self._control_headers = {
+            "Open-Shock-Token": token,
+            "Content-Type": "application/json",
+        }
+        self._dispatcher = OpenShockControlDispatcher(
+            self._send_commands, control_window
+        )
+        self._scheduler = OpenShockRequestScheduler()
+        self._scheduled: dict[asyncio.Task, frozenset[str]] = {}
+        self._read_retries = read_retries
+        self._hedge_control = hedge_control
+        self.breaker = OpenShockCircuitBreaker()
+        self._cache: dict[tuple[str, bool], _CachedResponse] = {}
+        self._in_flight: dict[tuple[str, bool], asyncio.Task] = {}
+        self._fresh: dict[tuple[str, bool], tuple[float, Any]] = {}
+        self.metrics = OpenShockApiMetrics()
+        self.read_timeout: float = READ_TIMEOUT
+        self.control_timeout: float = CONTROL_TIMEOUT
+
+    async def async_warm_up(self) -> None:
+        """Open a pooled connection to the API ahead of the first real request."""
+        try:
+            async with async_timeout.timeout(self.read_timeout):
+                response = await self._session.head(self._host)
+                response.release()
+        except (TimeoutError, aiohttp.ClientError, socket.gaierror) as exception:
+            LOGGER.debug("Unable to warm up connection - %s", exception)
 
     async def get_token(self) -> Any:
         """Get information about current token from the API."""
@@ -80,6 +516,14 @@ class OpenShockApiClient:
             url=f"/1/devices/{device}/shockers",
         )
 
+    async def get_own_shockers(self) -> list[OpenShockHub]:
+        """Get all devices and their shockers as records from the API."""
+        return await self._api_wrapper(
+            method="get",
+            url="/1/shockers/own",
+            decode=OpenShockHub.from_list,
+        )
+
     async def get_shocker(self, shocker: str) -> Any:
         """Get information about a shocker from the API."""
         return await self._api_wrapper(
@@ -87,24 +531,187 @@ class OpenShockApiClient:
             url=f"/1/shockers/{shocker}",
         )
 
+    async def get_shocker_logs(
+        self,
+        shocker: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> Any:
+        """Get a page of the control log of a shocker, newest first, from the API."""
+        return await self._api_wrapper(
+            method="get",
+            url=f"/1/shockers/{shocker}/logs?offset={offset}&limit={limit}",
+        )
+
     async def control_shocker(
         self,
         shocker: str,
         shocks: list[dict],
-    ) -> Any:
+    ) -> None:
         """Control a shocker from the API."""
-        for shock in shocks:
-            shock["id"] = shocker
-        return await self._api_wrapper(
-            method="post",
-            url="/2/shockers/control",
-            data={
-                "shocks": shocks,
-                "customName": "Home Assistant",
-            },
+        await self.control_shockers([{**shock, "id": shocker} for shock in shocks])
+
+    async def control_shockers(self, shocks: list[dict]) -> None:
+        """
+        Control shockers from the API.
+
+        Every command must carry the id of its shocker. The commands are not
+        modified, so callers can reuse prebuilt ones.
+        """
+        await self._dispatcher.submit(shocks)
+
+    async def send_scheduled(self, shocks: list[dict]) -> None:
+        """
+        Send control commands that must go out at a set time, such as pattern steps.
+
+        They skip the batching window and do not wait for the request bucket,
+        though they still use it up. The request is completed even if the
+        caller is cancelled, so an emergency stop can wait for it.
+        """
+        task = asyncio.get_running_loop().create_task(
+            self._send_control(shocks, scheduled=True)
         )
+        self._scheduled[task] = frozenset(shock["id"] for shock in shocks)
+        task.add_done_callback(self._scheduled.pop)
+        # Retrieved here in case the caller was cancelled.
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        await asyncio.shield(task)
+
+    async def emergency_stop(
+        self,
+        shocker_ids: list[str],
+    ) -> tuple[float, float | None]:
+        """
+        Stop shockers ahead of every other command.
+
+        Queued commands for the shockers are dropped and the stop skips the
+        batching window. Commands for them already in flight may still reach
+        the hub after the stop, so it is sent again once they are done.
+        Returns how long the stop took and how long until the resend was
+        done, None without a resend.
+        """
+        started = time.monotonic()
+        targets = set(shocker_ids)
+        in_flight = self._dispatcher.drop(targets) | {
+            task for task, ids in self._scheduled.items() if ids & targets
+        }
+        shocks = [
+            {
+                "id": shocker_id,
+                "type": "stop",
+                "intensity": 0,
+                "duration": MIN_DURATION,
+                "exclusive": True,
+            }
+            for shocker_id in shocker_ids
+        ]
+        await self._send_hedged(shocks)
+        stopped = time.monotonic() - started
+        if not in_flight:
+            return stopped, None
+        await asyncio.wait(in_flight, timeout=CONTROL_TIMEOUT)
+        await self._send_hedged(shocks)
+        return stopped, time.monotonic() - started
+
+    async def _send_commands(self, shocks: list[dict]) -> None:
+        """Send a batch from the dispatcher, hedged once if enabled."""
+        if self._hedge_control:
+            await self._send_hedged(shocks, attempts=2, delay=CONTROL_HEDGE_DELAY)
+        else:
+            await self._send_control(shocks)
+
+    async def _send_hedged(
+        self,
+        shocks: list[dict],
+        attempts: int = EMERGENCY_STOP_ATTEMPTS,
+        delay: float = EMERGENCY_STOP_HEDGE_DELAY,
+    ) -> None:
+        """
+        Send control commands, racing another attempt against a slow one.
+
+        A new attempt starts as soon as the previous one fails or has not
+        completed within `delay` seconds, up to `attempts` attempts. The first
+        success wins.
+        """
+        loop = asyncio.get_running_loop()
+        pending: set[asyncio.Task] = set()
+        error: BaseException | None = None
+        try:
+            for attempt in range(attempts):
+                pending.add(loop.create_task(self._send_control(shocks)))
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if attempt < attempts - 1 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if (error := task.exception()) is None:
+                        return
+                    if isinstance(error, OpenShockApiClientAuthenticationError):
+                        raise error
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if (error := task.exception()) is None:
+                        return
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error or OpenShockApiClientCommunicationError("Unable to send control")
 
-    async def _api_wrapper(
+    async def _send_control(
+        self,
+        shocks: list[dict],
+        *,
+        scheduled: bool = False,
+    ) -> None:
+        """
+        Send a batch of control commands to the API.
+
+        This skips the generic request path: headers and url are prebuilt, the
+        timeout is shorter and the response body is not read.
+        """
+        # Reads completed before a command may no longer be current.
+        self._fresh.clear()
+        body = json_bytes({"shocks": shocks, "customName": "Home Assistant"})
+        stop = any(shock["type"] == "stop" for shock in shocks)
+        # Stops are always attempted, even while the API seems down.
+        with self.breaker.guard(bypass=stop):
+            if scheduled:
+                self._scheduler.take()
+            else:
+                await self._scheduler.acquire(
+                    OpenShockRequestPriority.STOP
+                    if stop
+                    else OpenShockRequestPriority.CONTROL
+                )
+            # Only requests actually sent are measured.
+            with self.metrics.measure(CONTROL_ENDPOINT):
+                try:
+                    async with asyncio.timeout(self.control_timeout):
+                        async with self._session.post(
+                            self._control_url,
+                            data=body,
+                            headers=self._control_headers,
+                        ) as response:
+                            self._scheduler.update(response)
+                            _verify_response_or_raise(response)
+                except OpenShockApiClientError:
+                    raise
+                except TimeoutError as exception:
+                    msg = f"Timeout error sending control - {exception}"
+                    raise OpenShockApiClientCommunicationError(
+                        msg,
+                    ) from exception
+                except (aiohttp.ClientError, socket.gaierror) as exception:
+                    msg = f"Error sending control - {exception}"
+                    raise OpenShockApiClientCommunicationError(
+                        msg,
+                    ) from exception
+
+    async def _api_wrapper(  # noqa: PLR0913
         self,
         method: str,
         url: str,
@@ -112,37 +719,328 @@ class OpenShockApiClient:
         headers: dict | None = None,
         *,
         skip_to_data: bool = True,
+        priority: OpenShockRequestPriority = OpenShockRequestPriority.READ,
+        decode: Callable[[Any], Any] | None = None,
     ) -> Any:
-        """Get information from the API."""
+        """
+        Get information from the API.
+
+        Identical reads share one request while it is in flight, and its
+        result is reused for READ_CACHE_TTL seconds after it completed.
+        """
+        if method != "get":
+            return await self._request(
+                method,
+                url,
+                data,
+                headers,
+                skip_to_data=skip_to_data,
+                priority=priority,
+                decode=decode,
+            )
+        key = (url, skip_to_data)
+        if (fresh := self._fresh.get(key)) is not None and (
+            time.monotonic() < fresh[0]
+        ):
+            return fresh[1]
+        if (task := self._in_flight.get(key)) is None:
+            task = asyncio.get_running_loop().create_task(
+                self._read(
+                    url, skip_to_data=skip_to_data, priority=priority, decode=decode
+                )
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._read_done(key, task))
+        # A caller giving up does not cancel the read for the others.
+        return await asyncio.shield(task)
+
+    async def _read(
+        self,
+        url: str,
+        *,
+        skip_to_data: bool,
+        priority: OpenShockRequestPriority,
+        decode: Callable[[Any], Any] | None,
+    ) -> Any:
+        """Read from the API, retrying communication errors with jittered backoff."""
+        for attempt in range(self._read_retries + 1):
+            try:
+                return await self._request(
+                    "get",
+                    url,
+                    skip_to_data=skip_to_data,
+                    priority=priority,
+                    decode=decode,
+                )
+            except (
+                OpenShockApiClientRateLimitError,
+                OpenShockApiClientCircuitOpenError,
+            ):
+                raise
+            except OpenShockApiClientCommunicationError as exception:
+                if attempt == self._read_retries:
+                    raise
+                delay = random.uniform(0, RETRY_BACKOFF * 2**attempt)  # noqa: S311
+                LOGGER.debug("Retrying %s in %.2fs - %s", url, delay, exception)
+                await asyncio.sleep(delay)
+        return None
+
+    def expire_reads(self) -> None:
+        """Forget the reads kept for reuse, so the next ones hit the API."""
+        self._fresh.clear()
+
+    def _read_done(self, key: tuple[str, bool], task: asyncio.Task) -> None:
+        """Keep the result of a completed read for a short while."""
+        del self._in_flight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._fresh[key] = (time.monotonic() + READ_CACHE_TTL, task.result())
+
+    def _cache_response(
+        self,
+        key: tuple[str, bool],
+        cached: _CachedResponse,
+    ) -> None:
+        """
+        Keep a response to revalidate it, up to READ_CACHE_SIZE responses.
+
+        The least recently used one is dropped first, so pages of the shocker
+        logs do not pile up next to the polled endpoints.
+        """
+        self._cache.pop(key, None)
+        self._cache[key] = cached
+        if len(self._cache) > READ_CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
+
+    async def _request(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        *,
+        skip_to_data: bool = True,
+        priority: OpenShockRequestPriority = OpenShockRequestPriority.READ,
+        decode: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """Send a request to the API."""
+        path = url
         url = f"{self._host}{url}"
         headers = headers or {}
         headers["Open-Shock-Token"] = self._token
+        # Reads are revalidated, so unchanged resources are neither downloaded
+        # nor parsed again.
+        cache_key = (url, skip_to_data)
+        cached = self._cache.get(cache_key) if method == "get" else None
+        if cached is not None:
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+        with self.breaker.guard():
+            await self._scheduler.acquire(priority)
+            with self.metrics.measure(endpoint_name(method, path)):
+                try:
+                    async with async_timeout.timeout(self.read_timeout):
+                        response = await self._session.request(
+                            method=method,
+                            url=url,
+                            headers=headers,
+                            json=data,
+                        )
+                        self._scheduler.update(response)
+                        if (
+                            cached is not None
+                            and response.status == HTTPStatus.NOT_MODIFIED
+                        ):
+                            response.release()
+                            self._cache_response(cache_key, cached)
+                            return cached.data
+                        _verify_response_or_raise(response)
+                        result = await response.json(loads=json_loads)
+                        if skip_to_data:
+                            result = result["data"]
+                        if decode is not None:
+                            # Cached and shared reads keep the decoded records.
+                            result = decode(result)
+                        if method == "get" and (
+                            "ETag" in response.headers
+                            or "Last-Modified" in response.headers
+                        ):
+                            self._cache_response(
+                                cache_key,
+                                _CachedResponse(
+                                    etag=response.headers.get("ETag"),
+                                    last_modified=response.headers.get("Last-Modified"),
+                                    data=result,
+                                ),
+                            )
+                        return result
+
+                except OpenShockApiClientError:
+                    raise
+                except TimeoutError as exception:
+                    msg = f"Timeout error fetching information - {exception}"
+                    raise OpenShockApiClientCommunicationError(
+                        msg,
+                    ) from exception
+                except (aiohttp.ClientError, socket.gaierror) as exception:
+                    msg = f"Error fetching information - {exception}"
+                    raise OpenShockApiClientCommunicationError(
+                        msg,
+                    ) from exception
+                except Exception as exception:  # pylint: disable=broad-except
+                    msg = f"Something really wrong happened! - {exception}"
+                    raise OpenShockApiClientError(
+                        msg,
+                    ) from exception
+
+
+class OpenShockFailoverApiClient(OpenShockApiClient):
+    """OpenShock API client preferring a proxy of the API on the local network."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        local_host: str,
+        token: str,
+        session: aiohttp.ClientSession,
+        control_window: float = 0,
+        read_retries: int = DEFAULT_READ_RETRIES,
+        *,
+        hedge_control: bool = False,
+    ) -> None:
+        """
+        OpenShock API client preferring a proxy of the API on the local network.
+
+        Requests go to `local_host` first with a short timeout. It must relay
+        the same account as `host`, such as a reverse proxy in front of the
+        cloud API, since tokens and ids are not shared with other servers. It
+        only saves the latency to the cloud and does not keep control working
+        without internet. When it cannot be reached the request is sent to
+        `host` instead, and the local endpoint is skipped for
+        LOCAL_RETRY_INTERVAL seconds. Stops go to both at once.
+        """
+        super().__init__(
+            host,
+            token,
+            session,
+            control_window,
+            read_retries,
+            hedge_control=hedge_control,
+        )
+        # Failures of the local endpoint are not retried, the cloud takes over.
+        self._local = OpenShockApiClient(local_host, token, session, read_retries=0)
+        self._local.metrics = self.metrics
+        self._local.read_timeout = LOCAL_TIMEOUT
+        self._local.control_timeout = LOCAL_TIMEOUT
+        self._local_down_until = 0.0
+
+    @property
+    def local_available(self) -> bool:
+        """Return whether requests currently go to the local endpoint."""
+        return time.monotonic() >= self._local_down_until
+
+    async def async_warm_up(self) -> None:
+        """Open pooled connections to both endpoints."""
+        await asyncio.gather(super().async_warm_up(), self._local.async_warm_up())
+
+    async def _send_control(
+        self,
+        shocks: list[dict],
+        *,
+        scheduled: bool = False,
+    ) -> None:
+        """Send a batch of control commands, locally if possible."""
+        self._fresh.clear()
+        if self.local_available and any(shock["type"] == "stop" for shock in shocks):
+            # An unreachable local endpoint must not delay a stop.
+            await self._send_control_both(shocks, scheduled=scheduled)
+            return
+        if self.local_available:
+            try:
+                await self._local._send_control(  # noqa: SLF001
+                    shocks, scheduled=scheduled
+                )
+            except OpenShockApiClientCommunicationError as exception:
+                self._local_failed(exception)
+            else:
+                return
+        await super()._send_control(shocks, scheduled=scheduled)
+
+    async def _request(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        *,
+        skip_to_data: bool = True,
+        priority: OpenShockRequestPriority = OpenShockRequestPriority.READ,
+        decode: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """Send a request to the API, locally if possible."""
+        if self.local_available:
+            try:
+                return await self._local._request(  # noqa: SLF001
+                    method,
+                    url,
+                    data,
+                    dict(headers) if headers else None,
+                    skip_to_data=skip_to_data,
+                    priority=priority,
+                    decode=decode,
+                )
+            except OpenShockApiClientCommunicationError as exception:
+                self._local_failed(exception)
+        return await super()._request(
+            method,
+            url,
+            data,
+            headers,
+            skip_to_data=skip_to_data,
+            priority=priority,
+            decode=decode,
+        )
+
+    async def _send_control_both(
+        self,
+        shocks: list[dict],
+        *,
+        scheduled: bool,
+    ) -> None:
+        """Send control commands to both endpoints, the first success wins."""
+        loop = asyncio.get_running_loop()
+        local = loop.create_task(
+            self._local._send_control(shocks, scheduled=scheduled)  # noqa: SLF001
+        )
+        cloud = loop.create_task(super()._send_control(shocks, scheduled=scheduled))
+        pending = {local, cloud}
+        error: BaseException | None = None
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-                _verify_response_or_raise(response)
-                if skip_to_data:
-                    return (await response.json())["data"]
-                return await response.json()
-
-        except TimeoutError as exception:
-            msg = f"Timeout error fetching information - {exception}"
-            raise OpenShockApiClientCommunicationError(
-                msg,
-            ) from exception
-        except (aiohttp.ClientError, socket.gaierror) as exception:
-            LOGGER.info(await response.text())
-            msg = f"Error fetching information - {exception}"
-            raise OpenShockApiClientCommunicationError(
-                msg,
-            ) from exception
-        except Exception as exception:  # pylint: disable=broad-except
-            msg = f"Something really wrong happened! - {exception}"
-            raise OpenShockApiClientError(
-                msg,
-            ) from exception
+                for task in done:
+                    if (exception := task.exception()) is None:
+                        return
+                    if task is local and isinstance(
+                        exception, OpenShockApiClientCommunicationError
+                    ):
+                        self._local_failed(exception)
+                    if task is cloud or error is None:
+                        error = exception
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error
+
+    def _local_failed(self, exception: Exception) -> None:
+        """Use the cloud for a while after the local endpoint failed."""
+        if self.local_available:
+            LOGGER.warning(
+                "Local OpenShock API unreachable, using the cloud for %ss - %s",
+                LOCAL_RETRY_INTERVAL,
+                exception,
+            )
+        self._local_down_until = time.monotonic() + LOCAL_RETRY_INTERVAL
@@ -1,45 +1,109 @@
 """Support for OpenShock buttons."""
 
+from collections.abc import Iterable
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .coordinator import OpenShockDataUpdateCoordinator
+from .const import (
+    CONF_PUSH,
+    DEFAULT_PUSH,
+    SIGNAL_HUBS_ADDED,
+    SIGNAL_SHOCKERS_ADDED,
+)
+from .coordinator import (
+    OpenShockDataUpdateCoordinator,
+    OpenShockHubDataUpdateCoordinator,
+)
 from .data import OpenShockConfigEntry
-from .entity import OpenShockEntity
+from .entity import OpenShockEntity, OpenShockHubEntity, async_remove_entities
+
+PAUSED_DESCRIPTION = BinarySensorEntityDescription(
+    key="openshock-paused",
+    translation_key="paused",
+    icon="mdi:pause",
+    device_class=BinarySensorDeviceClass.LOCK,
+)
+
+ONLINE_DESCRIPTION = BinarySensorEntityDescription(
+    key="openshock-online",
+    translation_key="online",
+    device_class=BinarySensorDeviceClass.CONNECTIVITY,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument
+    hass: HomeAssistant,
     entry: OpenShockConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary_sensor platform."""
-    entities = [
-        [
+
+    @callback
+    def _async_add_shockers(
+        coordinators: Iterable[OpenShockDataUpdateCoordinator],
+    ) -> None:
+        """Add the entities of shockers."""
+        async_add_entities(
             OpenShockBinarySensor(
-                coordinator=coordinator,
-                entity_description=BinarySensorEntityDescription(
-                    key="openshock-paused",
-                    translation_key="paused",
-                    icon="mdi:pause",
-                    device_class=BinarySensorDeviceClass.LOCK,
+                coordinator=coordinator, entity_description=PAUSED_DESCRIPTION
+            )
+            for coordinator in coordinators
+        )
+
+    _async_add_shockers(entry.runtime_data.coordinators.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SHOCKERS_ADDED.format(entry.entry_id),
+            _async_add_shockers,
+        )
+    )
+
+    @callback
+    def _async_add_hubs(
+        hub_coordinators: Iterable[OpenShockHubDataUpdateCoordinator],
+    ) -> None:
+        """Add the entities of hubs, only known while pushing."""
+        if not entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+            async_remove_entities(
+                hass,
+                Platform.BINARY_SENSOR,
+                (
+                    f"{hub_coordinator.hub.id}-online"
+                    for hub_coordinator in hub_coordinators
                 ),
-            ),
-        ]
-        for coordinator in entry.runtime_data.coordinators.values()
-    ]
+            )
+            return
+        async_add_entities(
+            OpenShockHubOnlineSensor(
+                coordinator=hub_coordinator,
+                entity_description=ONLINE_DESCRIPTION,
+            )
+            for hub_coordinator in hub_coordinators
+        )
 
-    async_add_entities(x for xs in entities for x in xs)
+    _async_add_hubs(entry.runtime_data.coordinator.hubs.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_HUBS_ADDED.format(entry.entry_id), _async_add_hubs
+        )
+    )
 
 
 class OpenShockBinarySensor(OpenShockEntity, BinarySensorEntity):
     """OpenShock binary_sensor class."""
 
+    data_fields = frozenset({"is_paused"})
+
     def __init__(
         self,
         coordinator: OpenShockDataUpdateCoordinator,
@@ -48,11 +112,30 @@ class OpenShockBinarySensor(OpenShockEntity, BinarySensorEntity):
         """Initialize the number class."""
         super().__init__(coordinator)
         self.entity_description = entity_description
-        self._attr_unique_id = (
-            f"{coordinator.hub['id']}-{coordinator.shocker["id"]}-paused"
-        )
+        self._attr_unique_id = f"{coordinator.hub.id}-{coordinator.shocker.id}-paused"
 
     @property
     def is_on(self) -> bool:
         """Return the state of the sensor."""
-        return bool(self.coordinator.data.get("isPaused"))
+        return self.coordinator.data.is_paused
+
+
+class OpenShockHubOnlineSensor(OpenShockHubEntity, BinarySensorEntity):
+    """OpenShock hub connectivity binary_sensor class."""
+
+    def __init__(
+        self,
+        coordinator: OpenShockHubDataUpdateCoordinator,
+        entity_description: BinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary_sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.hub.id}-online"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return whether the hub is connected, if known."""
+        if self.coordinator.hub_status is None:
+            return None
+        return bool(self.coordinator.hub_status["online"])
@@ -1,103 +1,197 @@
 """Support for OpenShock buttons."""
 
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from custom_components.openshock.entity import OpenShockEntity
+from custom_components.openshock.entity import (
+    OpenShockAccountEntity,
+    OpenShockEntity,
+    OpenShockHubEntity,
+)
 
-from .coordinator import OpenShockDataUpdateCoordinator
+from .const import SIGNAL_HUBS_ADDED, SIGNAL_SHOCKERS_ADDED
+from .coordinator import (
+    OpenShockDataUpdateCoordinator,
+    OpenShockHubDataUpdateCoordinator,
+)
 from .data import OpenShockConfigEntry
+from .services import async_emergency_stop
+
+
+@dataclass(frozen=True, kw_only=True)
+class OpenShockButtonEntityDescription(ButtonEntityDescription):
+    """Describes an OpenShock button sending a command to a shocker."""
+
+    command: str
+
+
+BUTTONS: tuple[OpenShockButtonEntityDescription, ...] = (
+    OpenShockButtonEntityDescription(
+        key="openshock-stop",
+        name="Stop",
+        icon="mdi:stop",
+        command="stop",
+    ),
+    OpenShockButtonEntityDescription(
+        key="openshock-shock",
+        translation_key="shock",
+        icon="mdi:lightning-bolt",
+        command="shock",
+    ),
+    OpenShockButtonEntityDescription(
+        key="openshock-vibrate",
+        translation_key="vibrate",
+        icon="mdi:vibrate",
+        command="vibrate",
+    ),
+    OpenShockButtonEntityDescription(
+        key="openshock-sound",
+        translation_key="sound",
+        icon="mdi:bell",
+        command="sound",
+    ),
+)
+
+EMERGENCY_STOP_DESCRIPTION = ButtonEntityDescription(
+    key="openshock-emergency-stop",
+    translation_key="emergency_stop",
+    icon="mdi:alert-octagon",
+)
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument
+    hass: HomeAssistant,
     entry: OpenShockConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the button platform."""
-    entities = [
-        [
-            OpenShockButton(
-                coordinator=coordinator,
-                entity_description=ButtonEntityDescription(
-                    key="openshock-stop",
-                    name="Stop",
-                    icon="mdi:stop",
-                ),
-                button_command="stop",
-            ),
-            OpenShockButton(
-                coordinator=coordinator,
-                entity_description=ButtonEntityDescription(
-                    key="openshock-shock",
-                    translation_key="shock",
-                    icon="mdi:lightning-bolt",
-                ),
-                button_command="shock",
-            ),
-            OpenShockButton(
-                coordinator=coordinator,
-                entity_description=ButtonEntityDescription(
-                    key="openshock-vibrate",
-                    translation_key="vibrate",
-                    icon="mdi:vibrate",
-                ),
-                button_command="vibrate",
-            ),
-            OpenShockButton(
-                coordinator=coordinator,
-                entity_description=ButtonEntityDescription(
-                    key="openshock-sound",
-                    translation_key="sound",
-                    icon="mdi:bell",
-                ),
-                button_command="sound",
-            ),
-        ]
-        for coordinator in entry.runtime_data.coordinators.values()
-    ]
-
-    async_add_entities(x for xs in entities for x in xs)
+
+    @callback
+    def _async_add_shockers(
+        coordinators: Iterable[OpenShockDataUpdateCoordinator],
+    ) -> None:
+        """Add the entities of shockers."""
+        async_add_entities(
+            OpenShockButton(coordinator=coordinator, entity_description=description)
+            for coordinator in coordinators
+            for description in BUTTONS
+        )
+
+    _async_add_shockers(entry.runtime_data.coordinators.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SHOCKERS_ADDED.format(entry.entry_id),
+            _async_add_shockers,
+        )
+    )
+    async_add_entities([OpenShockAccountEmergencyStopButton(entry)])
+
+    @callback
+    def _async_add_hubs(
+        hub_coordinators: Iterable[OpenShockHubDataUpdateCoordinator],
+    ) -> None:
+        """Add the entities of hubs."""
+        async_add_entities(
+            OpenShockHubEmergencyStopButton(hub_coordinator)
+            for hub_coordinator in hub_coordinators
+        )
+
+    _async_add_hubs(entry.runtime_data.coordinator.hubs.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_HUBS_ADDED.format(entry.entry_id), _async_add_hubs
+        )
+    )
 
 
 class OpenShockButton(OpenShockEntity, ButtonEntity):
     """OpenShock button class."""
 
+    entity_description: OpenShockButtonEntityDescription
+
     def __init__(
         self,
         coordinator: OpenShockDataUpdateCoordinator,
-        entity_description: ButtonEntityDescription,
-        button_command: str,
+        entity_description: OpenShockButtonEntityDescription,
     ) -> None:
         """Initialize the button class."""
         super().__init__(coordinator)
         self.entity_description = entity_description
         self._attr_unique_id = (
-            f"{coordinator.hub['id']}-{coordinator.shocker["id"]}-{button_command}"
+            f"{coordinator.hub.id}-{coordinator.shocker.id}"
+            f"-{entity_description.command}"
         )
-        self.command = button_command
+        # Commands are built from a per-shocker template instead of from
+        # scratch on every press.
+        self._template = {
+            "id": coordinator.shocker.id,
+            "type": entity_description.command,
+            "intensity": 0,
+            "duration": 300,
+            "exclusive": True,
+        }
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        intensity = (
-            self.coordinator.intensities[f"{self.command}_intensity"]
-            if self.command != "stop"
-            else 0
+        if self.entity_description.command == "stop":
+            # Stops skip the queue, the same way the emergency stop does.
+            await async_emergency_stop(
+                self.coordinator.config_entry, [self.coordinator.shocker.id]
+            )
+            return
+        settings = self.coordinator.settings.command(self.entity_description.command)
+        shock = {
+            **self._template,
+            "intensity": settings.intensity,
+            "duration": settings.duration,
+        }
+        await self.coordinator.config_entry.runtime_data.client.control_shockers(
+            [shock]
         )
-        duration = (
-            self.coordinator.intensities[f"{self.command}_duration"]
-            if self.command != "stop"
-            else 300
+        self.coordinator.async_note_activity()
+
+
+class OpenShockAccountEmergencyStopButton(OpenShockAccountEntity, ButtonEntity):
+    """Button stopping every shocker of the account."""
+
+    _attr_entity_category = None
+    entity_description = EMERGENCY_STOP_DESCRIPTION
+
+    def __init__(self, entry: OpenShockConfigEntry) -> None:
+        """Initialize the button class."""
+        super().__init__(entry)
+        self._attr_unique_id = f"{entry.entry_id}-emergency_stop"
+
+    async def async_press(self) -> None:
+        """Handle the button press."""
+        await async_emergency_stop(
+            self.entry, list(self.entry.runtime_data.coordinators)
         )
-        await self.coordinator.config_entry.runtime_data.client.control_shocker(
-            self.coordinator.shocker["id"],
-            [
-                {
-                    "type": self.command,
-                    "intensity": intensity,
-                    "duration": duration,
-                    "exlusive": True,
-                }
-            ],
+
+
+class OpenShockHubEmergencyStopButton(OpenShockHubEntity, ButtonEntity):
+    """Button stopping every shocker of a hub."""
+
+    entity_description = EMERGENCY_STOP_DESCRIPTION
+
+    def __init__(self, coordinator: OpenShockHubDataUpdateCoordinator) -> None:
+        """Initialize the button class."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.hub.id}-emergency_stop"
+
+    @property
+    def available(self) -> bool:
+        """Return True, a stop is worth trying even when polling failed."""
+        return True
+
+    async def async_press(self) -> None:
+        """Handle the button press."""
+        await async_emergency_stop(
+            self.coordinator.config_entry, list(self.coordinator.shockers)
         )
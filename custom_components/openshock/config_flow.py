@@ -5,6 +5,7 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -16,9 +17,24 @@ from .api import (
     OpenShockApiClientError,
 )
 from .const import (
+    CONF_ALL_HUBS,
+    CONF_CONNECTION_LIMIT,
+    CONF_CONTROL_HEDGE,
+    CONF_CONTROL_WINDOW,
     CONF_HUB,
+    CONF_HUBS,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_LOCAL_HOST,
+    CONF_PUSH,
+    CONF_READ_RETRIES,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_CONTROL_HEDGE,
+    DEFAULT_CONTROL_WINDOW,
     DEFAULT_HOST,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_PUSH,
+    DEFAULT_READ_RETRIES,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     LOGGER,
@@ -28,7 +44,15 @@ from .const import (
 class OpenShockFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for OpenShock."""
 
-    VERSION = 1
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OpenShockOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OpenShockOptionsFlowHandler(config_entry)
 
     async def async_step_user(
         self,
@@ -43,7 +67,8 @@ class OpenShockFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 session=async_get_clientsession(self.hass),
             )
             try:
-                await self.client.get_token()
+                self.token_id = (await self.client.get_token())["id"]
+                self.devices = await self.client.get_devices()
             except OpenShockApiClientAuthenticationError as exception:
                 LOGGER.warning(exception)
                 _errors["base"] = "auth"
@@ -56,28 +81,12 @@ class OpenShockFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 self.host = user_input[CONF_HOST]
                 self.token = user_input[CONF_API_KEY]
+                self.local_host = user_input.get(CONF_LOCAL_HOST)
                 self.scan_interval = cv.time_period_dict(
                     user_input[CONF_UPDATE_INTERVAL]
                 ).total_seconds()
 
-                devices = [
-                    f"{device['name']} ({device['id']})"
-                    for device in await self.client.get_devices()
-                ]
-
-                return self.async_show_form(
-                    step_id="select_device",
-                    data_schema=vol.Schema(
-                        {
-                            vol.Required(
-                                CONF_HUB,
-                            ): selector.SelectSelector(
-                                selector.SelectSelectorConfig(options=devices),
-                            ),
-                        },
-                    ),
-                    errors=_errors,
-                )
+                return await self.async_step_select_device()
 
         return self.async_show_form(
             step_id="user",
@@ -96,6 +105,16 @@ class OpenShockFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                             type=selector.TextSelectorType.PASSWORD,
                         ),
                     ),
+                    vol.Optional(
+                        CONF_LOCAL_HOST,
+                        description={
+                            "suggested_value": (user_input or {}).get(CONF_LOCAL_HOST)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.URL,
+                        ),
+                    ),
                     vol.Required(
                         CONF_UPDATE_INTERVAL,
                         default=(user_input or {}).get(
@@ -111,40 +130,176 @@ class OpenShockFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self,
         user_input: dict | None = None,
     ) -> data_entry_flow.FlowResult:
-        """Handle a flow to select the device."""
+        """Handle a flow to select the hubs."""
         _errors = {}
+        configured = set()
+        for entry in self._async_current_entries():
+            hubs = entry.data.get(CONF_HUBS, [entry.data.get(CONF_HUB)])
+            if hubs is None:
+                if entry.data[CONF_API_KEY] == self.token:
+                    return self.async_abort(reason="already_configured")
+                # Entries covering all hubs of another token cover the hubs
+                # they have fetched.
+                if entry.state is config_entries.ConfigEntryState.LOADED:
+                    configured.update(entry.runtime_data.coordinator.data)
+                continue
+            configured.update(hubs)
+        devices = {
+            device["id"]: device["name"]
+            for device in self.devices
+            if device["id"] not in configured
+        }
+        if not devices:
+            return self.async_abort(reason="already_configured")
+
         if user_input is not None:
-            device_id = user_input[CONF_HUB].split(" (")[1][:-1]
-            device_name = user_input[CONF_HUB].split(" (")[0]
-
-            await self.async_set_unique_id(device_id)
-            self._abort_if_unique_id_configured()
-
-            return self.async_create_entry(
-                title=device_name,
-                data={
-                    CONF_HOST: self.host,
-                    CONF_API_KEY: self.token,
-                    CONF_HUB: device_id,
-                    CONF_UPDATE_INTERVAL: self.scan_interval,
-                },
-            )
+            hubs = user_input.get(CONF_HUBS, [])
+            if user_input[CONF_ALL_HUBS]:
+                # Hubs of other entries would be polled twice and their
+                # entities would clash.
+                if len(devices) < len(self.devices):
+                    _errors["base"] = "hubs_configured"
+                    return self._async_show_select_device(devices, _errors)
+                await self.async_set_unique_id(self.token_id)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title="OpenShock",
+                    data={
+                        CONF_HOST: self.host,
+                        CONF_API_KEY: self.token,
+                        CONF_LOCAL_HOST: self.local_host,
+                        CONF_HUBS: None,
+                        CONF_UPDATE_INTERVAL: self.scan_interval,
+                    },
+                )
+            if hubs:
+                await self.async_set_unique_id(",".join(sorted(hubs)))
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=", ".join(devices[hub] for hub in hubs),
+                    data={
+                        CONF_HOST: self.host,
+                        CONF_API_KEY: self.token,
+                        CONF_LOCAL_HOST: self.local_host,
+                        CONF_HUBS: hubs,
+                        CONF_UPDATE_INTERVAL: self.scan_interval,
+                    },
+                )
+            _errors["base"] = "no_hubs"
 
-        devices = [
-            f"{device['name']} ({device['id']})"
-            for device in await self.client.get_devices()
-        ]
+        return self._async_show_select_device(devices, _errors)
 
+    @callback
+    def _async_show_select_device(
+        self,
+        devices: dict[str, str],
+        errors: dict[str, str],
+    ) -> data_entry_flow.FlowResult:
+        """Show the form to select the hubs."""
         return self.async_show_form(
             step_id="select_device",
             data_schema=vol.Schema(
                 {
-                    vol.Required(
-                        CONF_HUB,
+                    vol.Optional(
+                        CONF_HUBS,
                     ): selector.SelectSelector(
-                        selector.SelectSelectorConfig(options=devices),
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=hub, label=name)
+                                for hub, name in devices.items()
+                            ],
+                            multiple=True,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_ALL_HUBS,
+                        default=False,
+                    ): selector.BooleanSelector(),
+                },
+            ),
+            errors=errors,
+        )
+
+
+class OpenShockOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for OpenShock."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_PUSH,
+                        default=self.config_entry.options.get(CONF_PUSH, DEFAULT_PUSH),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_CONTROL_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_CONTROL_WINDOW, DEFAULT_CONTROL_WINDOW
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=500,
+                            unit_of_measurement="ms",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_CONTROL_HEDGE,
+                        default=self.config_entry.options.get(
+                            CONF_CONTROL_HEDGE, DEFAULT_CONTROL_HEDGE
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_READ_RETRIES,
+                        default=self.config_entry.options.get(
+                            CONF_READ_RETRIES, DEFAULT_READ_RETRIES
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=5,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_CONNECTION_LIMIT,
+                        default=self.config_entry.options.get(
+                            CONF_CONNECTION_LIMIT, DEFAULT_CONNECTION_LIMIT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=100,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_KEEPALIVE_TIMEOUT,
+                        default=self.config_entry.options.get(
+                            CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=3600,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
                     ),
                 },
             ),
-            errors=_errors,
         )
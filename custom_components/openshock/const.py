@@ -10,5 +10,61 @@ CONF_UPDATE_INTERVAL = "update_interval"
 DEFAULT_SCAN_INTERVAL = {"seconds": 30}
 
 CONF_HUB = "hub"
+CONF_HUBS = "hubs"
+CONF_ALL_HUBS = "all_hubs"
 
 DEFAULT_HOST = "https://api.openshock.app"
+CONF_LOCAL_HOST = "local_host"
+LOCAL_TIMEOUT = 1
+LOCAL_RETRY_INTERVAL = 60
+
+CONF_PUSH = "push"
+DEFAULT_PUSH = False
+
+CONF_CONTROL_WINDOW = "control_window"
+DEFAULT_CONTROL_WINDOW = 0
+
+CONF_CONNECTION_LIMIT = "connection_limit"
+DEFAULT_CONNECTION_LIMIT = 10
+CONF_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+
+SIGNAL_HUBS_ADDED = "openshock_hubs_added_{}"
+SIGNAL_SHOCKERS_ADDED = "openshock_shockers_added_{}"
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+
+BURST_INTERVAL = 5
+BURST_DURATION = 60
+RELAX_AFTER = 10
+RELAX_MAX_FACTOR = 4
+BACKOFF_MAX = 900
+
+RATE_LIMIT_RATE = 2.0
+RATE_LIMIT_BURST = 10
+
+READ_TIMEOUT = 10
+READ_CACHE_TTL = 2
+READ_CACHE_SIZE = 32
+CONTROL_TIMEOUT = 5
+CONF_READ_RETRIES = "read_retries"
+DEFAULT_READ_RETRIES = 2
+RETRY_BACKOFF = 0.5
+CONF_CONTROL_HEDGE = "control_hedge"
+DEFAULT_CONTROL_HEDGE = False
+CONTROL_HEDGE_DELAY = 1
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 60
+EMERGENCY_STOP_ATTEMPTS = 3
+EMERGENCY_STOP_HEDGE_DELAY = 0.25
+
+MIN_DURATION = 300
+MAX_DURATION = 30000
+
+METRICS_WINDOW = 1000
+
+LOG_IMPORT_INTERVAL = {"minutes": 15}
+LOG_PAGE_SIZE = 100
+LOG_MAX_PAGES = 50
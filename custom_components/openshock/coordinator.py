@@ -2,37 +2,103 @@
 
 from __future__ import annotations
 
+import random
+import time
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     OpenShockApiClientAuthenticationError,
+    OpenShockApiClientCircuitOpenError,
     OpenShockApiClientError,
+    OpenShockApiClientRateLimitError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    BACKOFF_MAX,
+    BURST_DURATION,
+    BURST_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    RELAX_AFTER,
+    RELAX_MAX_FACTOR,
+    SIGNAL_HUBS_ADDED,
+    SIGNAL_SHOCKERS_ADDED,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .data import OpenShockShockerSettings
+from .models import SHOCKER_FIELDS, OpenShockHub, OpenShockShocker
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
 
     from .data import OpenShockConfigEntry
 
 
+class OpenShockPollScheduler:
+    """Pick the next poll interval from recent activity and failures."""
+
+    def __init__(self, interval: timedelta) -> None:
+        """Initialize."""
+        self.interval = interval
+        self._burst_until = 0.0
+        self._unchanged = 0
+        self._failures = 0
+
+    def note_activity(self) -> None:
+        """Poll at the burst interval for a while."""
+        self._burst_until = time.monotonic() + BURST_DURATION
+        self._unchanged = 0
+
+    def in_burst(self) -> bool:
+        """Return whether polling is currently bursting."""
+        return time.monotonic() < self._burst_until
+
+    def next_interval(self, *, changed: bool) -> timedelta:
+        """Return the interval after a successful poll."""
+        self._failures = 0
+        if changed:
+            self.note_activity()
+        else:
+            self._unchanged += 1
+        if self.in_burst():
+            return min(self.interval, timedelta(seconds=BURST_INTERVAL))
+        # Double the interval for every RELAX_AFTER polls without changes.
+        factor = min(2 ** (self._unchanged // RELAX_AFTER), RELAX_MAX_FACTOR)
+        return self.interval * factor
+
+    def backoff_interval(self, retry_after: float | None = None) -> timedelta:
+        """Return the interval after a failed poll."""
+        self._failures += 1
+        delay = min(
+            self.interval.total_seconds() * 2**self._failures,
+            BACKOFF_MAX,
+        )
+        delay = random.uniform(delay / 2, delay)  # noqa: S311
+        return timedelta(seconds=max(delay, retry_after or 0))
+
+
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class OpenShockDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+class OpenShockAccountDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching every hub and shocker of the account from the API."""
 
     config_entry: OpenShockConfigEntry
-    intensities: dict[str, int]
 
     def __init__(
         self,
         hass: HomeAssistant,
         update_interval: int,
-        hub: Any,
-        shocker: Any,
+        hub_ids: list[str] | None,
     ) -> None:
         """Initialize."""
         super().__init__(
@@ -40,18 +106,370 @@ class OpenShockDataUpdateCoordinator(DataUpdateCoordinator):
             logger=LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=update_interval),
+            always_update=False,
         )
-        self.hub = hub
-        self.shocker = shocker
-        self.intensities = {}
+        self.hub_ids = hub_ids
+        self.hubs: dict[str, OpenShockHubDataUpdateCoordinator] = {}
+        self._scheduler = OpenShockPollScheduler(self.update_interval)
+        self._push_connected = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{self.config_entry.entry_id}"
+        )
+        self._snapshot: dict[str, Any] | None = None
+
+    async def async_load_snapshot(self) -> bool:
+        """Restore the hubs and their shockers as last fetched from the API."""
+        snapshot = await self._store.async_load()
+        if snapshot is None or "hubs" not in snapshot:
+            return False
+        self._snapshot = snapshot
+        self.data = {
+            hub.id: hub for hub in map(OpenShockHub.from_dict, snapshot["hubs"])
+        }
+        return True
+
+    @callback
+    def async_save_snapshot(self) -> None:
+        """Store the hubs and their shockers for the next startup if they changed."""
+        snapshot = {"hubs": [hub.as_dict() for hub in self.data.values()]}
+        if snapshot != self._snapshot:
+            self._snapshot = snapshot
+            self._store.async_delay_save(lambda: snapshot, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_update_topology(self) -> None:
+        """
+        Add and remove hub and shocker coordinators to match the fetched hubs.
+
+        Platforms are told about added coordinators through dispatcher signals,
+        the devices of removed ones are removed with their entities.
+        """
+        entry = self.config_entry
+        coordinators = entry.runtime_data.coordinators
+        shockers = {
+            shocker.id: hub_id
+            for hub_id, hub in self.data.items()
+            for shocker in hub.shockers
+        }
+        removed = [
+            shocker_id
+            for shocker_id, coordinator in coordinators.items()
+            if shockers.get(shocker_id) != coordinator.hub.id
+        ]
+        removed_hubs = [hub_id for hub_id in self.hubs if hub_id not in self.data]
+        for shocker_id in removed:
+            coordinator = coordinators.pop(shocker_id)
+            del coordinator.hub_coordinator.shockers[shocker_id]
+        for hub_id in removed_hubs:
+            del self.hubs[hub_id]
+        if removed or removed_hubs:
+            entry.runtime_data.patterns.cancel(removed)
+            _async_remove_devices(self.hass, entry, [*removed, *removed_hubs])
+
+        added_hubs = []
+        added = []
+        for hub_id, hub in self.data.items():
+            if (hub_coordinator := self.hubs.get(hub_id)) is None:
+                hub_coordinator = OpenShockHubDataUpdateCoordinator(
+                    self.hass, self, hub
+                )
+                self.hubs[hub_id] = hub_coordinator
+                added_hubs.append(hub_coordinator)
+            for shocker in hub.shockers:
+                if shocker.id in coordinators:
+                    continue
+                coordinator = OpenShockDataUpdateCoordinator(
+                    self.hass, hub_coordinator, shocker
+                )
+                hub_coordinator.shockers[shocker.id] = coordinator
+                coordinators[shocker.id] = coordinator
+                added.append(coordinator)
+        if added_hubs:
+            async_dispatcher_send(
+                self.hass, SIGNAL_HUBS_ADDED.format(entry.entry_id), added_hubs
+            )
+        if added:
+            async_dispatcher_send(
+                self.hass, SIGNAL_SHOCKERS_ADDED.format(entry.entry_id), added
+            )
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
         try:
-            return await self.config_entry.runtime_data.client.get_shocker(
-                self.shocker["id"]
-            )
+            hubs = await self.config_entry.runtime_data.client.get_own_shockers()
         except OpenShockApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
+        except OpenShockApiClientRateLimitError as exception:
+            self._async_set_poll_interval(
+                self._scheduler.backoff_interval(exception.retry_after)
+            )
+            raise UpdateFailed(exception) from exception
+        except OpenShockApiClientCircuitOpenError as exception:
+            # Poll again once the client lets a probe through.
+            self._async_set_poll_interval(
+                timedelta(seconds=max(exception.retry_after, BURST_INTERVAL))
+            )
+            raise UpdateFailed(exception) from exception
         except OpenShockApiClientError as exception:
+            self._async_set_poll_interval(self._scheduler.backoff_interval())
             raise UpdateFailed(exception) from exception
+
+        data = {
+            hub.id: hub
+            for hub in hubs
+            if self.hub_ids is None or hub.id in self.hub_ids
+        }
+        self._async_set_poll_interval(
+            self._scheduler.next_interval(
+                changed=self.data is not None and data != self.data
+            )
+        )
+        return data
+
+    @callback
+    def _async_set_poll_interval(self, interval: timedelta) -> None:
+        """Use the given poll interval unless updates are pushed."""
+        if not self._push_connected:
+            self.update_interval = interval
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll more often for a while after a command was sent."""
+        was_bursting = self._scheduler.in_burst()
+        self._scheduler.note_activity()
+        if was_bursting or self._push_connected or not self._listeners:
+            return
+        self.update_interval = min(
+            self._scheduler.interval, timedelta(seconds=BURST_INTERVAL)
+        )
+        self._schedule_refresh()
+
+    @callback
+    def async_update_hubs(self) -> None:
+        """Fan the latest account refresh out to the hub coordinators."""
+        if self.last_update_success:
+            self.async_save_snapshot()
+            self.async_update_topology()
+        for hub_id, hub_coordinator in self.hubs.items():
+            if not self.last_update_success:
+                hub_coordinator.async_set_update_error(self.last_exception)
+            elif (hub := self.data.get(hub_id)) is not None:
+                hub_coordinator.async_set_hub(hub)
+
+    @callback
+    def async_set_push_connected(self, connected: bool) -> None:  # noqa: FBT001
+        """Stop polling while the push connection is up and resume when it drops."""
+        LOGGER.debug("Push connection %s", "up" if connected else "down")
+        self._push_connected = connected
+        self.update_interval = None if connected else self._scheduler.interval
+        if not connected:
+            # Hub status is only known while the push connection is up.
+            for hub_coordinator in self.hubs.values():
+                hub_coordinator.async_set_hub_status(None)
+        # Catch up on anything missed while disconnected, or restart polling.
+        self.config_entry.async_create_task(self.hass, self.async_request_refresh())
+
+    @callback
+    def async_handle_push_event(self, target: str, arguments: list[Any]) -> None:
+        """Feed a realtime event from the user hub into the coordinators."""
+        if target == "DeviceStatus" and _is_list_of_dicts(arguments, 0):
+            for status in arguments[0]:
+                if (
+                    hub_coordinator := self.hubs.get(status.get("device"))
+                ) is not None and isinstance(status.get("online"), bool):
+                    hub_coordinator.async_set_hub_status(status)
+        elif target == "DeviceUpdate" and arguments:
+            # Polling is off while pushing, so hubs new to the account are
+            # picked up here too.
+            if (
+                arguments[0] in self.hubs
+                or self.hub_ids is None
+                or arguments[0] in self.hub_ids
+            ):
+                self.config_entry.async_create_task(
+                    self.hass, self.async_request_refresh()
+                )
+        elif target == "Log" and _is_list_of_dicts(arguments, 1):
+            coordinators = self.config_entry.runtime_data.coordinators
+            for log in arguments[1]:
+                shocker = log.get("shocker")
+                if (
+                    isinstance(shocker, dict)
+                    and (coordinator := coordinators.get(shocker.get("id"))) is not None
+                ):
+                    coordinator.async_set_last_control(log)
+        else:
+            LOGGER.debug("Ignoring push event %s - %s", target, arguments)
+
+
+class OpenShockHubDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to hold the shockers of a hub, fed by the account coordinator."""
+
+    config_entry: OpenShockConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        account_coordinator: OpenShockAccountDataUpdateCoordinator,
+        hub: OpenShockHub,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass=hass,
+            logger=LOGGER,
+            name=DOMAIN,
+            always_update=False,
+        )
+        self.config_entry = account_coordinator.config_entry
+        self.account_coordinator = account_coordinator
+        self.hub_status: dict[str, Any] | None = None
+        self.status_changed: datetime | None = None
+        self.shockers: dict[str, OpenShockDataUpdateCoordinator] = {}
+        self.hub, self.data = _split_hub(hub)
+
+    @callback
+    def async_set_hub(self, hub: OpenShockHub) -> None:
+        """Set the hub as fetched by the account coordinator and fan it out."""
+        self.hub, shockers = _split_hub(hub)
+        if not self.last_update_success or shockers != self.data:
+            self.async_set_updated_data(shockers)
+        for shocker_id, coordinator in self.shockers.items():
+            shocker = shockers.get(shocker_id)
+            if shocker is not None and not coordinator.async_is_current(shocker):
+                coordinator.async_set_updated_data(shocker)
+
+    @callback
+    def async_set_hub_status(self, status: dict[str, Any] | None) -> None:
+        """Set the online status and firmware of the hub as pushed by the server."""
+        if status == self.hub_status:
+            return
+        previous, self.hub_status = self.hub_status, status
+        # When the hub came online or went offline, as far as pushed.
+        if status is not None and (
+            previous is None or status["online"] != previous["online"]
+        ):
+            self.status_changed = dt_util.utcnow()
+        self.async_update_listeners()
+
+    @callback
+    def async_set_update_error(self, err: Exception) -> None:
+        """Mark the hub and its shockers as failed to update."""
+        super().async_set_update_error(err)
+        for coordinator in self.shockers.values():
+            coordinator.async_set_update_error(err)
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll the account more often for a while after a command was sent."""
+        self.account_coordinator.async_note_activity()
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh of the account, which refreshes every hub."""
+        await self.account_coordinator.async_request_refresh()
+
+    async def _async_update_data(self) -> Any:
+        """Return the shockers as last fetched by the account coordinator."""
+        if not self.account_coordinator.last_update_success:
+            raise UpdateFailed(self.account_coordinator.last_exception)
+        if (hub := self.account_coordinator.data.get(self.hub.id)) is None:
+            return self.data
+        return _split_hub(hub)[1]
+
+
+def _async_remove_devices(
+    hass: HomeAssistant,
+    entry: OpenShockConfigEntry,
+    identifiers: list[str],
+) -> None:
+    """Remove the devices of removed hubs and shockers, and so their entities."""
+    device_registry = dr.async_get(hass)
+    for identifier in identifiers:
+        if (
+            device := device_registry.async_get_device(
+                identifiers={(DOMAIN, identifier)}
+            )
+        ) is not None:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+
+
+def _is_list_of_dicts(arguments: list[Any], index: int) -> bool:
+    """Return whether an event argument is a list of objects."""
+    return (
+        len(arguments) > index
+        and isinstance(arguments[index], list)
+        and all(isinstance(item, dict) for item in arguments[index])
+    )
+
+
+def _split_hub(
+    hub: OpenShockHub,
+) -> tuple[OpenShockHub, dict[str, OpenShockShocker]]:
+    """Split a hub into the hub itself and its shockers by id."""
+    return hub, {shocker.id: shocker for shocker in hub.shockers}
+
+
+class OpenShockDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to hold the data of a single shocker, fed by its hub coordinator."""
+
+    config_entry: OpenShockConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub_coordinator: OpenShockHubDataUpdateCoordinator,
+        shocker: OpenShockShocker,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass=hass,
+            logger=LOGGER,
+            name=DOMAIN,
+        )
+        self.config_entry = hub_coordinator.config_entry
+        self.hub_coordinator = hub_coordinator
+        self.hub = hub_coordinator.hub
+        self.shocker = shocker
+        self.settings = OpenShockShockerSettings()
+        self.last_control: dict[str, Any] | None = None
+        self.changed_fields: frozenset[str] = frozenset()
+        self.data = shocker
+
+    @callback
+    def async_set_updated_data(self, data: OpenShockShocker) -> None:
+        """Set the shocker data and record which of its fields changed."""
+        previous = self.data
+        self.changed_fields = frozenset(
+            key
+            for key in SHOCKER_FIELDS
+            if previous is None or getattr(data, key) != getattr(previous, key)
+        )
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_set_last_control(self, log: dict[str, Any]) -> None:
+        """Record the latest control log entry of the shocker."""
+        self.last_control = log
+        self.changed_fields = frozenset({"last_control"})
+        self.async_update_listeners()
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll the hub more often for a while after a command was sent."""
+        self.hub_coordinator.async_note_activity()
+
+    @callback
+    def async_is_current(self, shocker: OpenShockShocker) -> bool:
+        """Return whether the entities already show this shocker data."""
+        return self.last_update_success and shocker == self.data
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh of the hub, which refreshes all of its shockers."""
+        await self.hub_coordinator.async_request_refresh()
+
+    async def _async_update_data(self) -> Any:
+        """Return the shocker as last fetched by the hub coordinator."""
+        if not self.hub_coordinator.last_update_success:
+            raise UpdateFailed(self.hub_coordinator.last_exception)
+        return self.hub_coordinator.data.get(self.shocker.id, self.data)
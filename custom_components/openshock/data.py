@@ -10,7 +10,11 @@ if TYPE_CHECKING:
     from homeassistant.loader import Integration
 
     from .api import OpenShockApiClient
-    from .coordinator import OpenShockDataUpdateCoordinator
+    from .coordinator import (
+        OpenShockAccountDataUpdateCoordinator,
+        OpenShockDataUpdateCoordinator,
+    )
+    from .pattern import OpenShockPatternPlayer
 
 
 type OpenShockConfigEntry = ConfigEntry[OpenShockData]
@@ -22,6 +26,30 @@ class OpenShockData:
 
     client: OpenShockApiClient
     integration: Integration
+    coordinator: OpenShockAccountDataUpdateCoordinator
+    patterns: OpenShockPatternPlayer
     coordinators: dict[str, OpenShockDataUpdateCoordinator] = field(
         default_factory=dict
     )
+    setup_timings: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class OpenShockCommandSettings:
+    """Intensity and duration of a command, as set by the number entities."""
+
+    intensity: int = 20
+    duration: int = 10000
+
+
+@dataclass(slots=True)
+class OpenShockShockerSettings:
+    """Settings of the commands of a shocker."""
+
+    shock: OpenShockCommandSettings = field(default_factory=OpenShockCommandSettings)
+    vibrate: OpenShockCommandSettings = field(default_factory=OpenShockCommandSettings)
+    sound: OpenShockCommandSettings = field(default_factory=OpenShockCommandSettings)
+
+    def command(self, command: str) -> OpenShockCommandSettings:
+        """Return the settings of a command."""
+        return getattr(self, command)
@@ -0,0 +1,33 @@
+"""Diagnostics support for OpenShock."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_API_KEY
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import OpenShockConfigEntry
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument
+    entry: OpenShockConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "setup_timings": entry.runtime_data.setup_timings,
+        "metrics": entry.runtime_data.client.metrics.as_dict(),
+        "circuit": {
+            "state": entry.runtime_data.client.breaker.state,
+            "failures": entry.runtime_data.client.breaker.failures,
+            "last_error": entry.runtime_data.client.breaker.last_error,
+        },
+        "hubs": [hub.as_dict() for hub in entry.runtime_data.coordinator.data.values()],
+    }
@@ -2,15 +2,36 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .coordinator import OpenShockDataUpdateCoordinator
+from .const import DOMAIN
+from .coordinator import (
+    OpenShockDataUpdateCoordinator,
+    OpenShockHubDataUpdateCoordinator,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import OpenShockConfigEntry
 
 
 class OpenShockEntity(CoordinatorEntity[OpenShockDataUpdateCoordinator]):
     """OpenShockEntity class."""
 
+    # Fields of the shocker data this entity shows, changes to any other field
+    # do not cause a state write.
+    data_fields: frozenset[str] = frozenset()
+
     def __init__(self, coordinator: OpenShockDataUpdateCoordinator) -> None:
         """Initialize."""
         super().__init__(coordinator)
@@ -19,11 +40,85 @@ class OpenShockEntity(CoordinatorEntity[OpenShockDataUpdateCoordinator]):
             identifiers={
                 (
                     coordinator.config_entry.domain,
-                    coordinator.shocker["id"],
+                    coordinator.shocker.id,
+                ),
+            },
+            name=coordinator.shocker.name,
+            model=coordinator.shocker.model,
+            serial_number=coordinator.shocker.rf_id,
+            via_device=(coordinator.config_entry.domain, coordinator.hub.id),
+        )
+        self._written_available: bool | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if something this entity shows changed."""
+        available = self.available
+        if available == self._written_available and not (
+            self.coordinator.changed_fields & self.data_fields
+        ):
+            return
+        self._written_available = available
+        super()._handle_coordinator_update()
+
+
+class OpenShockHubEntity(CoordinatorEntity[OpenShockHubDataUpdateCoordinator]):
+    """OpenShockHubEntity class, for entities of a whole hub."""
+
+    def __init__(self, coordinator: OpenShockHubDataUpdateCoordinator) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.has_entity_name = True
+        self._attr_device_info = DeviceInfo(
+            identifiers={
+                (
+                    coordinator.config_entry.domain,
+                    coordinator.hub.id,
                 ),
             },
-            name=coordinator.shocker["name"],
-            model=coordinator.shocker["model"],
-            serial_number=coordinator.shocker["rfId"],
-            via_device=(coordinator.config_entry.domain, coordinator.hub["id"]),
+            name=coordinator.hub.name,
+            manufacturer="OpenShock",
+            via_device=(
+                coordinator.config_entry.domain,
+                coordinator.config_entry.entry_id,
+            ),
         )
+
+
+class OpenShockAccountEntity(Entity):
+    """OpenShockAccountEntity class, for diagnostics of a whole config entry."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry: OpenShockConfigEntry) -> None:
+        """Initialize."""
+        self.entry = entry
+        self.has_entity_name = True
+        self._attr_device_info = DeviceInfo(
+            identifiers={(entry.domain, entry.entry_id)},
+            name=entry.title,
+            manufacturer="OpenShock",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+
+@callback
+def async_remove_entities(
+    hass: HomeAssistant,
+    platform: str,
+    unique_ids: Iterable[str],
+) -> None:
+    """Remove entities that are no longer created from the entity registry."""
+    entity_registry = er.async_get(hass)
+    for unique_id in unique_ids:
+        if (
+            entity_id := entity_registry.async_get_entity_id(
+                platform, DOMAIN, unique_id
+            )
+        ) is not None:
+            entity_registry.async_remove(entity_id)
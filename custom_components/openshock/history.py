@@ -0,0 +1,213 @@
+"""Import of the shocker control logs as long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import PERCENTAGE, UnitOfTime
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import OpenShockApiClientError
+from .const import (
+    DOMAIN,
+    LOG_MAX_PAGES,
+    LOG_PAGE_SIZE,
+    LOGGER,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import OpenShockConfigEntry
+
+
+@dataclass(slots=True)
+class _HourlyStatistics:
+    """Statistics of one shocker for the hour being imported."""
+
+    start: datetime
+    count: int = 0
+    duration: float = 0
+    intensity_sum: int = 0
+    intensity_min: int = 100
+    intensity_max: int = 0
+
+    def add(self, log: dict[str, Any]) -> None:
+        """Add a log entry to the hour."""
+        self.count += 1
+        self.duration += log["duration"] / 1000
+        self.intensity_sum += log["intensity"]
+        self.intensity_min = min(self.intensity_min, log["intensity"])
+        self.intensity_max = max(self.intensity_max, log["intensity"])
+
+
+class OpenShockLogImporter:
+    """Import new control log entries of every shocker as hourly statistics."""
+
+    def __init__(self, hass: HomeAssistant, entry: OpenShockConfigEntry) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.logs"
+        )
+        self._cursors: dict[str, Any] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_import(self, _: datetime | None = None) -> None:
+        """Fetch the log entries added since the last import and import them."""
+        async with self._lock:
+            if self._cursors is None:
+                self._cursors = await self._store.async_load() or {}
+            for shocker_id in list(self.entry.runtime_data.coordinators):
+                if shocker_id not in self.entry.runtime_data.coordinators:
+                    continue
+                cursor = self._cursors.get(shocker_id)
+                try:
+                    logs = await self._async_fetch_new(shocker_id, cursor)
+                except OpenShockApiClientError as exception:
+                    LOGGER.debug(
+                        "Unable to fetch the logs of %s - %s", shocker_id, exception
+                    )
+                    continue
+                # The shocker may have been removed while its logs were fetched.
+                coordinator = self.entry.runtime_data.coordinators.get(shocker_id)
+                if logs and coordinator is not None:
+                    self._cursors[shocker_id] = self._async_add_statistics(
+                        shocker_id, coordinator.shocker.name, cursor, logs
+                    )
+            cursors = self._cursors
+            self._store.async_delay_save(lambda: cursors, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the stored cursors."""
+        await self._store.async_remove()
+
+    async def _async_fetch_new(
+        self,
+        shocker_id: str,
+        cursor: dict[str, Any] | None,
+    ) -> list[dict[str, Any]]:
+        """
+        Page through the log of a shocker until the entry at the cursor.
+
+        The API returns the newest entries first, the result is oldest first.
+        """
+        client = self.entry.runtime_data.client
+        logs: list[dict[str, Any]] = []
+        for page in range(LOG_MAX_PAGES):
+            entries = await client.get_shocker_logs(
+                shocker_id, offset=page * LOG_PAGE_SIZE, limit=LOG_PAGE_SIZE
+            )
+            for log in entries:
+                if cursor is not None and (
+                    log["id"] == cursor["id"] or log["createdOn"] < cursor["createdOn"]
+                ):
+                    return logs[::-1]
+                logs.append(log)
+            if len(entries) < LOG_PAGE_SIZE:
+                break
+        return logs[::-1]
+
+    def _async_add_statistics(
+        self,
+        shocker_id: str,
+        name: str,
+        cursor: dict[str, Any] | None,
+        logs: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Add the statistics of new log entries in one insert per statistic.
+
+        The cursor carries the sums up to the last imported hour and that hour
+        itself, it is imported again when new entries fall into it.
+        """
+        count_sum = cursor["count_sum"] if cursor else 0
+        duration_sum = cursor["duration_sum"] if cursor else 0
+        hour = (
+            _HourlyStatistics(
+                **{
+                    **cursor["hour"],
+                    "start": dt_util.parse_datetime(cursor["hour"]["start"]),
+                }
+            )
+            if cursor and cursor["hour"]
+            else None
+        )
+        counts: list[StatisticData] = []
+        durations: list[StatisticData] = []
+        intensities: list[StatisticData] = []
+
+        def _add_hour(hour: _HourlyStatistics) -> None:
+            counts.append(
+                StatisticData(
+                    start=hour.start, state=hour.count, sum=count_sum + hour.count
+                )
+            )
+            durations.append(
+                StatisticData(
+                    start=hour.start,
+                    state=hour.duration,
+                    sum=duration_sum + hour.duration,
+                )
+            )
+            intensities.append(
+                StatisticData(
+                    start=hour.start,
+                    mean=hour.intensity_sum / hour.count,
+                    min=hour.intensity_min,
+                    max=hour.intensity_max,
+                )
+            )
+
+        for log in logs:
+            if str(log["type"]).lower() == "stop":
+                continue
+            created = dt_util.as_utc(dt_util.parse_datetime(log["createdOn"]))
+            start = created.replace(minute=0, second=0, microsecond=0)
+            if hour is None or start > hour.start:
+                if hour is not None:
+                    _add_hour(hour)
+                    count_sum += hour.count
+                    duration_sum += hour.duration
+                hour = _HourlyStatistics(start=start)
+            hour.add(log)
+        if hour is not None:
+            _add_hour(hour)
+
+        object_id = shocker_id.lower().replace("-", "_")
+        for key, unit, statistics, has_sum in (
+            ("controls", None, counts, True),
+            ("control_duration", UnitOfTime.SECONDS, durations, True),
+            ("intensity", PERCENTAGE, intensities, False),
+        ):
+            if statistics:
+                async_add_external_statistics(
+                    self.hass,
+                    StatisticMetaData(
+                        has_mean=not has_sum,
+                        has_sum=has_sum,
+                        name=f"{name} {key.replace('_', ' ')}",
+                        source=DOMAIN,
+                        statistic_id=f"{DOMAIN}:{object_id}_{key}",
+                        unit_of_measurement=unit,
+                    ),
+                    statistics,
+                )
+
+        return {
+            "id": logs[-1]["id"],
+            "createdOn": logs[-1]["createdOn"],
+            "count_sum": count_sum,
+            "duration_sum": duration_sum,
+            "hour": {**asdict(hour), "start": hour.start.isoformat()} if hour else None,
+        }
@@ -0,0 +1,119 @@
+"""Request metrics for the OpenShock API client."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from .const import METRICS_WINDOW
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_ID = re.compile(r"/[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}")
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """Return the endpoint of a request with ids and query replaced."""
+    return f"{method.upper()} {_ID.sub('/{id}', url.partition('?')[0])}"
+
+
+def _quantile(latencies: list[float], quantile: float) -> float:
+    """Return a quantile of sorted latencies, interpolating between samples."""
+    position = quantile * (len(latencies) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(latencies) - 1)
+    return latencies[lower] + (latencies[upper] - latencies[lower]) * (position - lower)
+
+
+class OpenShockEndpointMetrics:
+    """Request count, errors and latencies of one endpoint."""
+
+    __slots__ = ("count", "errors", "latencies")
+
+    def __init__(self, window: int) -> None:
+        """Initialize."""
+        self.count = 0
+        self.errors: dict[str, int] = {}
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float, error: BaseException | None) -> None:
+        """Record a finished request."""
+        self.count += 1
+        self.latencies.append(latency)
+        if error is not None:
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def percentiles(self, *quantiles: float) -> list[float | None]:
+        """Return latency percentiles in seconds over the recent requests."""
+        if not self.latencies:
+            return [None for _ in quantiles]
+        latencies = sorted(self.latencies)
+        return [_quantile(latencies, quantile) for quantile in quantiles]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dict."""
+        p50, p95, p99 = self.percentiles(0.5, 0.95, 0.99)
+        return {
+            "count": self.count,
+            "errors": dict(self.errors),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+
+
+class OpenShockApiMetrics:
+    """Per-endpoint request metrics of an API client."""
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        """
+        Per-endpoint request metrics of an API client.
+
+        Counts are kept for the lifetime of the client, latency percentiles
+        cover the last `window` requests of each endpoint.
+        """
+        self._window = window
+        self.endpoints: dict[str, OpenShockEndpointMetrics] = {}
+
+    @contextmanager
+    def measure(self, endpoint: str) -> Iterator[None]:
+        """Time the wrapped request and record its outcome."""
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Given up by the caller, such as the losing attempt of a hedged
+            # send, the request did not fail.
+            raise
+        except BaseException as exception:
+            self.endpoint(endpoint).record(time.monotonic() - started, exception)
+            raise
+        self.endpoint(endpoint).record(time.monotonic() - started, None)
+
+    def endpoint(self, endpoint: str) -> OpenShockEndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = OpenShockEndpointMetrics(self._window)
+        return metrics
+
+    @property
+    def request_count(self) -> int:
+        """Return the number of requests sent."""
+        return sum(metrics.count for metrics in self.endpoints.values())
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed requests."""
+        return sum(sum(metrics.errors.values()) for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of every endpoint as a dict."""
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()
+        }
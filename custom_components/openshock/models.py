@@ -0,0 +1,74 @@
+"""Compact records of the OpenShock API payloads."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class OpenShockShocker:
+    """A shocker, with only the fields the integration uses."""
+
+    id: str
+    name: str
+    model: str
+    rf_id: int
+    is_paused: bool
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OpenShockShocker:
+        """Create a shocker from its API payload."""
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            model=data["model"],
+            rf_id=data["rfId"],
+            is_paused=bool(data.get("isPaused")),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the shocker in the format of its API payload."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "model": self.model,
+            "rfId": self.rf_id,
+            "isPaused": self.is_paused,
+        }
+
+
+SHOCKER_FIELDS = tuple(field.name for field in fields(OpenShockShocker))
+
+
+@dataclass(frozen=True, slots=True)
+class OpenShockHub:
+    """A hub and its shockers."""
+
+    id: str
+    name: str
+    shockers: tuple[OpenShockShocker, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OpenShockHub:
+        """Create a hub from its API payload."""
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            shockers=tuple(
+                OpenShockShocker.from_dict(shocker) for shocker in data["shockers"]
+            ),
+        )
+
+    @classmethod
+    def from_list(cls, data: list[dict[str, Any]]) -> list[OpenShockHub]:
+        """Create hubs from the payload of /1/shockers/own."""
+        return [cls.from_dict(hub) for hub in data]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the hub in the format of its API payload."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "shockers": [shocker.as_dict() for shocker in self.shockers],
+        }
@@ -1,145 +1,133 @@
 """Support for OpenShock buttons."""
 
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 from homeassistant.components.number import (
     NumberEntityDescription,
     RestoreNumber,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .const import MAX_DURATION, MIN_DURATION, SIGNAL_SHOCKERS_ADDED
 from .coordinator import OpenShockDataUpdateCoordinator
 from .data import OpenShockConfigEntry
 from .entity import OpenShockEntity
 
 
+@dataclass(frozen=True, kw_only=True)
+class OpenShockNumberEntityDescription(NumberEntityDescription):
+    """Describes an OpenShock number setting a command of a shocker."""
+
+    command: str
+    setting: str
+
+
+NUMBERS: tuple[OpenShockNumberEntityDescription, ...] = (
+    *(
+        OpenShockNumberEntityDescription(
+            key=f"openshock-{command}-intensity",
+            translation_key=f"{command}_intensity",
+            icon=icon,
+            native_unit_of_measurement="%",
+            command=command,
+            setting="intensity",
+        )
+        for command, icon in (
+            ("shock", "mdi:lightning-bolt"),
+            ("vibrate", "mdi:vibrate"),
+            ("sound", "mdi:bell"),
+        )
+    ),
+    *(
+        OpenShockNumberEntityDescription(
+            key=f"openshock-{command}-duration",
+            translation_key=f"{command}_duration",
+            icon=icon,
+            native_unit_of_measurement="ms",
+            native_max_value=MAX_DURATION,
+            native_min_value=MIN_DURATION,
+            command=command,
+            setting="duration",
+        )
+        for command, icon in (
+            ("shock", "mdi:lightning-bolt"),
+            ("vibrate", "mdi:vibrate"),
+            ("sound", "mdi:bell"),
+        )
+    ),
+)
+
+
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument
+    hass: HomeAssistant,
     entry: OpenShockConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the number platform."""
-    entities = [
-        [
-            OpenShockNumber(
-                coordinator=coordinator,
-                entity_description=NumberEntityDescription(
-                    key="openshock-shock-intensity",
-                    translation_key="shock_intensity",
-                    icon="mdi:lightning-bolt",
-                    native_unit_of_measurement="%",
-                ),
-                related_command="shock",
-                related_type="intensity",
-                default_value=20,
-            ),
-            OpenShockNumber(
-                coordinator=coordinator,
-                entity_description=NumberEntityDescription(
-                    key="openshock-vibrate-intensity",
-                    translation_key="vibrate_intensity",
-                    icon="mdi:vibrate",
-                    native_unit_of_measurement="%",
-                ),
-                related_command="vibrate",
-                related_type="intensity",
-                default_value=20,
-            ),
-            OpenShockNumber(
-                coordinator=coordinator,
-                entity_description=NumberEntityDescription(
-                    key="openshock-sound-intensity",
-                    translation_key="sound_intensity",
-                    icon="mdi:bell",
-                    native_unit_of_measurement="%",
-                ),
-                related_command="sound",
-                related_type="intensity",
-                default_value=20,
-            ),
-            OpenShockNumber(
-                coordinator=coordinator,
-                entity_description=NumberEntityDescription(
-                    key="openshock-shock-duration",
-                    translation_key="shock_duration",
-                    icon="mdi:lightning-bolt",
-                    native_unit_of_measurement="ms",
-                    native_max_value=30000,
-                    native_min_value=300,
-                ),
-                related_command="shock",
-                related_type="duration",
-                default_value=10000,
-            ),
-            OpenShockNumber(
-                coordinator=coordinator,
-                entity_description=NumberEntityDescription(
-                    key="openshock-vibrate-duration",
-                    translation_key="vibrate_duration",
-                    icon="mdi:vibrate",
-                    native_unit_of_measurement="ms",
-                    native_max_value=30000,
-                    native_min_value=300,
-                ),
-                related_command="vibrate",
-                related_type="duration",
-                default_value=10000,
-            ),
-            OpenShockNumber(
-                coordinator=coordinator,
-                entity_description=NumberEntityDescription(
-                    key="openshock-sound-duration",
-                    translation_key="sound_duration",
-                    icon="mdi:bell",
-                    native_unit_of_measurement="ms",
-                    native_max_value=30000,
-                    native_min_value=300,
-                ),
-                related_command="sound",
-                related_type="duration",
-                default_value=10000,
-            ),
-        ]
-        for coordinator in entry.runtime_data.coordinators.values()
-    ]
-
-    async_add_entities(x for xs in entities for x in xs)
+
+    @callback
+    def _async_add_shockers(
+        coordinators: Iterable[OpenShockDataUpdateCoordinator],
+    ) -> None:
+        """Add the entities of shockers."""
+        async_add_entities(
+            OpenShockNumber(coordinator=coordinator, entity_description=description)
+            for coordinator in coordinators
+            for description in NUMBERS
+        )
+
+    _async_add_shockers(entry.runtime_data.coordinators.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SHOCKERS_ADDED.format(entry.entry_id),
+            _async_add_shockers,
+        )
+    )
 
 
 class OpenShockNumber(OpenShockEntity, RestoreNumber):
     """OpenShock number class."""
 
+    entity_description: OpenShockNumberEntityDescription
+
     def __init__(
         self,
         coordinator: OpenShockDataUpdateCoordinator,
-        entity_description: NumberEntityDescription,
-        related_command: str,
-        related_type: str,
-        default_value: int,
+        entity_description: OpenShockNumberEntityDescription,
     ) -> None:
         """Initialize the number class."""
         super().__init__(coordinator)
         self.entity_description = entity_description
-        self._attr_unique_id = f"{coordinator.hub['id']}-{coordinator.shocker["id"]}-{related_command}-{related_type}"  # noqa: E501
-        self.command = related_command
-        self.type = related_type
-        self.default_value = default_value
+        self._attr_unique_id = (
+            f"{coordinator.hub.id}-{coordinator.shocker.id}"
+            f"-{entity_description.command}-{entity_description.setting}"
+        )
+        # The settings of the command are looked up once, state reads only
+        # read an attribute.
+        self._settings = coordinator.settings.command(entity_description.command)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
         last_data = await self.async_get_last_number_data()
         if last_data is not None and last_data.native_value is not None:
-            self.set_native_value(last_data.native_value)
-        else:
-            self.set_native_value(self.default_value)
+            setattr(
+                self._settings,
+                self.entity_description.setting,
+                int(last_data.native_value),
+            )
 
-    def set_native_value(self, value: float) -> None:
+    async def async_set_native_value(self, value: float) -> None:
         """Set the native value of the sensor."""
-        self.coordinator.intensities[f"{self.command}_{self.type}"] = int(value)
+        setattr(self._settings, self.entity_description.setting, int(value))
+        # Coordinator updates do not write the state of settings.
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> float:
         """Return the native value of the sensor."""
-        return self.coordinator.intensities.get(
-            f"{self.command}_{self.type}", self.default_value
-        )
+        return getattr(self._settings, self.entity_description.setting)
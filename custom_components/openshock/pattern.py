@@ -0,0 +1,152 @@
+"""Pattern playback for openshock."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER, MAX_DURATION
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .api import OpenShockApiClient
+
+
+@dataclass(frozen=True, slots=True)
+class OpenShockPatternStep:
+    """A command sent to every shocker of a pattern at the same offset."""
+
+    offset: float
+    type: str
+    intensity: int
+    duration: int
+
+
+def compile_pattern(steps: Iterable[dict[str, Any]]) -> list[OpenShockPatternStep]:
+    """
+    Turn pattern steps into commands at offsets from the start in seconds.
+
+    Steps with durations and gaps in milliseconds are merged with the previous
+    one when it continues without a gap, so they cost no extra request.
+    """
+    compiled: list[OpenShockPatternStep] = []
+    offset = 0
+    previous_gap = None
+    for step in steps:
+        last = compiled[-1] if compiled else None
+        if (
+            last is not None
+            and previous_gap == 0
+            and last.type == step["type"]
+            and last.intensity == step["intensity"]
+            and last.duration + step["duration"] <= MAX_DURATION
+        ):
+            compiled[-1] = OpenShockPatternStep(
+                offset=last.offset,
+                type=last.type,
+                intensity=last.intensity,
+                duration=last.duration + step["duration"],
+            )
+        else:
+            compiled.append(
+                OpenShockPatternStep(
+                    offset=offset / 1000,
+                    type=step["type"],
+                    intensity=step["intensity"],
+                    duration=step["duration"],
+                )
+            )
+        previous_gap = step["gap"]
+        offset += step["duration"] + step["gap"]
+    return compiled
+
+
+class OpenShockPatternPlayer:
+    """Play patterns on shockers, at most one pattern per shocker at a time."""
+
+    def __init__(self, client: OpenShockApiClient) -> None:
+        """Initialize."""
+        self._client = client
+        self._playing: dict[str, tuple[asyncio.Task, set[str]]] = {}
+
+    def play(
+        self,
+        shocker_ids: list[str],
+        steps: list[OpenShockPatternStep],
+    ) -> asyncio.Task:
+        """Start a pattern, replacing any pattern playing on the same shockers."""
+        self.cancel(shocker_ids)
+        targets = set(shocker_ids)
+        task = asyncio.get_running_loop().create_task(
+            self._async_play(targets, steps), name="openshock pattern"
+        )
+        for shocker_id in shocker_ids:
+            self._playing[shocker_id] = (task, targets)
+        task.add_done_callback(lambda _: self._forget(targets, task))
+        return task
+
+    def cancel(self, shocker_ids: Iterable[str] | None = None) -> None:
+        """Take shockers out of their patterns, or cancel all patterns."""
+        if shocker_ids is None:
+            shocker_ids = list(self._playing)
+        for shocker_id in shocker_ids:
+            if (playing := self._playing.pop(shocker_id, None)) is None:
+                continue
+            task, targets = playing
+            targets.discard(shocker_id)
+            # The other shockers keep playing the pattern.
+            if not targets:
+                task.cancel()
+
+    def _forget(self, shocker_ids: set[str], task: asyncio.Task) -> None:
+        """Drop a finished pattern."""
+        for shocker_id in shocker_ids:
+            if self._playing.get(shocker_id, (None,))[0] is task:
+                del self._playing[shocker_id]
+
+    async def _async_play(
+        self,
+        shocker_ids: set[str],
+        steps: list[OpenShockPatternStep],
+    ) -> None:
+        """Send every step at its offset from the start."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sends: set[asyncio.Task] = set()
+        try:
+            for step in steps:
+                # Offsets are relative to the start, so the time spent sending
+                # a step does not delay the ones after it.
+                await asyncio.sleep(max(start + step.offset - loop.time(), 0))
+                shocks = [
+                    {
+                        "id": shocker_id,
+                        "type": step.type,
+                        "intensity": step.intensity,
+                        "duration": step.duration,
+                        "exclusive": True,
+                    }
+                    for shocker_id in shocker_ids
+                ]
+                if not shocks:
+                    break
+                # Steps are sent on time, without the batching window and
+                # without waiting for the request bucket.
+                send = loop.create_task(self._client.send_scheduled(shocks))
+                sends.add(send)
+                send.add_done_callback(sends.discard)
+                send.add_done_callback(_log_failure)
+            if sends:
+                await asyncio.wait(sends)
+        except asyncio.CancelledError:
+            for send in sends:
+                send.cancel()
+            raise
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    """Log a pattern step that could not be sent."""
+    if not task.cancelled() and (exception := task.exception()) is not None:
+        LOGGER.warning("Unable to send pattern step - %s", exception)
@@ -0,0 +1,130 @@
+"""Realtime push client for the OpenShock user hub."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# SignalR JSON hub protocol, see
+# https://github.com/dotnet/aspnetcore/blob/main/src/SignalR/docs/specs/HubProtocol.md
+RECORD_SEPARATOR = "\x1e"
+HANDSHAKE = json.dumps({"protocol": "json", "version": 1}) + RECORD_SEPARATOR
+PING = json.dumps({"type": 6}) + RECORD_SEPARATOR
+MESSAGE_INVOCATION = 1
+MESSAGE_PING = 6
+MESSAGE_CLOSE = 7
+
+PING_INTERVAL = 15
+SERVER_TIMEOUT = 30
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+
+class OpenShockPushError(Exception):
+    """Exception to indicate the push connection was lost or refused."""
+
+
+class OpenShockPushClient:
+    """OpenShock push client keeping one WebSocket connection to the user hub."""
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        session: aiohttp.ClientSession,
+        on_event: Callable[[str, list[Any]], None],
+        on_connection_change: Callable[[bool], None],
+    ) -> None:
+        """OpenShock push client."""
+        self._url = f"{host}/1/hubs/user"
+        self._token = token
+        self._session = session
+        self._on_event = on_event
+        self._on_connection_change = on_connection_change
+        self.connected = False
+
+    async def run(self) -> None:
+        """Keep the connection open, reconnecting with backoff until cancelled."""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                await self._listen()
+            except (
+                aiohttp.ClientError,
+                OpenShockPushError,
+                TimeoutError,
+                ValueError,
+            ) as exception:
+                LOGGER.debug("Push connection lost - %s", exception)
+            except Exception:  # noqa: BLE001
+                # Anything unexpected must not end the task while the
+                # coordinator still believes the connection is up.
+                LOGGER.exception("Unexpected error in the push connection")
+            if self.connected:
+                delay = RECONNECT_MIN_DELAY
+            self._set_connected(connected=False)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _listen(self) -> None:
+        """Connect, perform the handshake and dispatch messages until closed."""
+        async with self._session.ws_connect(
+            self._url,
+            headers={"Open-Shock-Token": self._token},
+        ) as websocket:
+            await websocket.send_str(HANDSHAKE)
+            handshake_done = False
+            last_received = time.monotonic()
+            while True:
+                try:
+                    message = await websocket.receive(timeout=PING_INTERVAL)
+                except TimeoutError:
+                    if time.monotonic() - last_received > SERVER_TIMEOUT:
+                        msg = "Server timed out"
+                        raise OpenShockPushError(msg) from None
+                    await websocket.send_str(PING)
+                    continue
+
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    msg = f"Connection closed ({message.type.name})"
+                    raise OpenShockPushError(msg)
+
+                last_received = time.monotonic()
+                for record in message.data.split(RECORD_SEPARATOR):
+                    if not record:
+                        continue
+                    payload = json.loads(record)
+                    if not handshake_done:
+                        if "error" in payload:
+                            raise OpenShockPushError(payload["error"])
+                        handshake_done = True
+                        self._set_connected(connected=True)
+                        continue
+                    self._handle_message(payload)
+
+    def _handle_message(self, payload: dict[str, Any]) -> None:
+        """Dispatch a single hub protocol message."""
+        if payload.get("type") == MESSAGE_INVOCATION:
+            try:
+                self._on_event(payload["target"], payload.get("arguments", []))
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Unable to handle push event %s", payload)
+        elif payload.get("type") == MESSAGE_CLOSE:
+            msg = payload.get("error") or "Server closed the connection"
+            raise OpenShockPushError(msg)
+
+    def _set_connected(self, *, connected: bool) -> None:
+        """Track the connection state and report changes."""
+        if self.connected == connected:
+            return
+        self.connected = connected
+        self._on_connection_change(connected)
@@ -0,0 +1,300 @@
+"""Support for OpenShock sensors."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from .api import CONTROL_ENDPOINT, OpenShockCircuitState
+from .const import CONF_PUSH, DEFAULT_PUSH, SIGNAL_HUBS_ADDED, SIGNAL_SHOCKERS_ADDED
+from .entity import (
+    OpenShockAccountEntity,
+    OpenShockEntity,
+    OpenShockHubEntity,
+    async_remove_entities,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
+
+    from .coordinator import (
+        OpenShockDataUpdateCoordinator,
+        OpenShockHubDataUpdateCoordinator,
+    )
+    from .data import OpenShockConfigEntry
+    from .metrics import OpenShockApiMetrics
+
+# Metrics are read from memory, polling them costs no requests.
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class OpenShockMetricsSensorEntityDescription(SensorEntityDescription):
+    """Describes an OpenShock API metrics sensor."""
+
+    value_fn: Callable[[OpenShockApiMetrics], StateType]
+
+
+def _control_latency(quantile: float) -> Callable[[OpenShockApiMetrics], StateType]:
+    """Return a function reading a control latency percentile in milliseconds."""
+
+    def _value(metrics: OpenShockApiMetrics) -> StateType:
+        latency = metrics.endpoint(CONTROL_ENDPOINT).percentiles(quantile)[0]
+        return None if latency is None else round(latency * 1000)
+
+    return _value
+
+
+METRICS_SENSORS: tuple[OpenShockMetricsSensorEntityDescription, ...] = (
+    *(
+        OpenShockMetricsSensorEntityDescription(
+            key=f"openshock-control-latency-p{percentile}",
+            translation_key=f"control_latency_p{percentile}",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_control_latency(percentile / 100),
+        )
+        for percentile in (50, 95, 99)
+    ),
+    OpenShockMetricsSensorEntityDescription(
+        key="openshock-requests",
+        translation_key="requests",
+        icon="mdi:swap-vertical",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.request_count,
+    ),
+    OpenShockMetricsSensorEntityDescription(
+        key="openshock-request-errors",
+        translation_key="request_errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.error_count,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class OpenShockHubSensorEntityDescription(SensorEntityDescription):
+    """Describes an OpenShock hub sensor."""
+
+    value_fn: Callable[[OpenShockHubDataUpdateCoordinator], StateType | datetime]
+
+
+HUB_SENSORS: tuple[OpenShockHubSensorEntityDescription, ...] = (
+    OpenShockHubSensorEntityDescription(
+        key="openshock-status-changed",
+        translation_key="status_changed",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.status_changed,
+    ),
+    OpenShockHubSensorEntityDescription(
+        key="openshock-firmware",
+        translation_key="firmware",
+        icon="mdi:chip",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: (coordinator.hub_status or {}).get(
+            "firmwareVersion"
+        ),
+    ),
+)
+
+LAST_CONTROL_DESCRIPTION = SensorEntityDescription(
+    key="openshock-last-control",
+    translation_key="last_control",
+    icon="mdi:history",
+    device_class=SensorDeviceClass.TIMESTAMP,
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: OpenShockConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the sensor platform."""
+    async_add_entities(
+        [
+            *(
+                OpenShockMetricsSensor(entry=entry, entity_description=description)
+                for description in METRICS_SENSORS
+            ),
+            OpenShockCircuitSensor(entry=entry),
+        ]
+    )
+
+    @callback
+    def _async_add_hubs(
+        hub_coordinators: Iterable[OpenShockHubDataUpdateCoordinator],
+    ) -> None:
+        """Add the sensors of hubs, only known while pushing."""
+        if not entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+            async_remove_entities(
+                hass,
+                Platform.SENSOR,
+                (
+                    f"{hub_coordinator.hub.id}-{description.key}"
+                    for hub_coordinator in hub_coordinators
+                    for description in HUB_SENSORS
+                ),
+            )
+            return
+        async_add_entities(
+            OpenShockHubSensor(
+                coordinator=hub_coordinator, entity_description=description
+            )
+            for hub_coordinator in hub_coordinators
+            for description in HUB_SENSORS
+        )
+
+    _async_add_hubs(entry.runtime_data.coordinator.hubs.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_HUBS_ADDED.format(entry.entry_id), _async_add_hubs
+        )
+    )
+
+    @callback
+    def _async_add_shockers(
+        coordinators: Iterable[OpenShockDataUpdateCoordinator],
+    ) -> None:
+        """Add the sensors of shockers, only known while pushing."""
+        if not entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+            async_remove_entities(
+                hass,
+                Platform.SENSOR,
+                (
+                    f"{coordinator.hub.id}-{coordinator.shocker.id}-last_control"
+                    for coordinator in coordinators
+                ),
+            )
+            return
+        async_add_entities(
+            OpenShockLastControlSensor(coordinator) for coordinator in coordinators
+        )
+
+    _async_add_shockers(entry.runtime_data.coordinators.values())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_SHOCKERS_ADDED.format(entry.entry_id), _async_add_shockers
+        )
+    )
+
+
+class OpenShockMetricsSensor(OpenShockAccountEntity, SensorEntity):
+    """OpenShock API metrics sensor class."""
+
+    entity_description: OpenShockMetricsSensorEntityDescription
+
+    def __init__(
+        self,
+        entry: OpenShockConfigEntry,
+        entity_description: OpenShockMetricsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(entry)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{entry.entry_id}-{entity_description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.entry.runtime_data.client.metrics)
+
+
+class OpenShockCircuitSensor(OpenShockAccountEntity, SensorEntity):
+    """OpenShock API circuit breaker state sensor class."""
+
+    entity_description = SensorEntityDescription(
+        key="openshock-api-state",
+        translation_key="api_state",
+        icon="mdi:api",
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in OpenShockCircuitState],
+    )
+
+    def __init__(self, entry: OpenShockConfigEntry) -> None:
+        """Initialize the sensor class."""
+        super().__init__(entry)
+        self._attr_unique_id = f"{entry.entry_id}-{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> str:
+        """Return the state of the circuit breaker."""
+        return self.entry.runtime_data.client.breaker.state.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the consecutive failures and the last error."""
+        breaker = self.entry.runtime_data.client.breaker
+        return {"failures": breaker.failures, "last_error": breaker.last_error}
+
+
+class OpenShockHubSensor(OpenShockHubEntity, SensorEntity):
+    """OpenShock hub sensor class, fed by the pushed hub status."""
+
+    entity_description: OpenShockHubSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: OpenShockHubDataUpdateCoordinator,
+        entity_description: OpenShockHubSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.hub.id}-{entity_description.key}"
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+
+class OpenShockLastControlSensor(OpenShockEntity, SensorEntity):
+    """OpenShock sensor of the latest control of a shocker, as pushed by the server."""
+
+    data_fields = frozenset({"last_control"})
+    entity_description = LAST_CONTROL_DESCRIPTION
+
+    def __init__(self, coordinator: OpenShockDataUpdateCoordinator) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self._attr_unique_id = (
+            f"{coordinator.hub.id}-{coordinator.shocker.id}-last_control"
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the shocker was last controlled."""
+        if (log := self.coordinator.last_control) is None:
+            return None
+        return dt_util.parse_datetime(str(log.get("executedAt", "")))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the type, intensity and duration of the latest control."""
+        log = self.coordinator.last_control or {}
+        return {
+            "type": log.get("type"),
+            "intensity": log.get("intensity"),
+            "duration": log.get("duration"),
+        }
@@ -0,0 +1,234 @@
+"""Services for openshock."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import (
+    ServiceTargetSelector,
+    async_extract_referenced_entity_ids,
+)
+
+from .api import OpenShockApiClientError
+from .const import DOMAIN, LOGGER, MAX_DURATION, MIN_DURATION
+from .pattern import compile_pattern
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .data import OpenShockConfigEntry
+
+SERVICE_CONTROL = "control"
+SERVICE_EMERGENCY_STOP = "emergency_stop"
+SERVICE_PLAY_PATTERN = "play_pattern"
+
+ATTR_TYPE = "type"
+ATTR_INTENSITY = "intensity"
+ATTR_DURATION = "duration"
+ATTR_STEPS = "steps"
+
+VALID_INTENSITY = vol.All(vol.Coerce(int), vol.Range(0, 100))
+VALID_DURATION = vol.All(vol.Coerce(int), vol.Range(MIN_DURATION, MAX_DURATION))
+
+CONTROL_SCHEMA = vol.Schema(
+    {
+        **cv.TARGET_SERVICE_FIELDS,
+        vol.Required(ATTR_TYPE): vol.In(["stop", "shock", "vibrate", "sound"]),
+        vol.Optional(ATTR_INTENSITY): VALID_INTENSITY,
+        vol.Optional(ATTR_DURATION): VALID_DURATION,
+    }
+)
+
+EMERGENCY_STOP_SCHEMA = vol.Schema(cv.TARGET_SERVICE_FIELDS)
+
+STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TYPE): vol.In(["shock", "vibrate", "sound"]),
+        vol.Required(ATTR_INTENSITY): VALID_INTENSITY,
+        vol.Required(ATTR_DURATION): VALID_DURATION,
+        vol.Optional("gap", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+PLAY_PATTERN_SCHEMA = vol.Schema(
+    {
+        **cv.TARGET_SERVICE_FIELDS,
+        vol.Required(ATTR_STEPS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [STEP_SCHEMA]
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_control(call: ServiceCall) -> None:
+        """Send one command to the targeted shockers, one request per entry."""
+        await asyncio.gather(
+            *(
+                _async_control_entry(entry, shocker_ids, call)
+                for entry, shocker_ids in async_resolve_shockers(hass, call).items()
+            )
+        )
+
+    async def async_emergency_stop_service(call: ServiceCall) -> ServiceResponse:
+        """Stop the targeted shockers, or every shocker without a target."""
+        if ServiceTargetSelector(call).has_any_selector:
+            shockers = async_resolve_shockers(hass, call)
+        else:
+            shockers = {
+                entry: list(entry.runtime_data.coordinators)
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+            }
+        timings = await asyncio.gather(
+            *(
+                async_emergency_stop(entry, shocker_ids)
+                for entry, shocker_ids in shockers.items()
+            )
+        )
+        resends = [resent for _, resent in timings if resent is not None]
+        return {
+            "shockers": sum(len(shocker_ids) for shocker_ids in shockers.values()),
+            "duration_ms": round(
+                max((stopped for stopped, _ in timings), default=0) * 1000
+            ),
+            "resend_ms": round(max(resends) * 1000) if resends else None,
+        }
+
+    async def async_play_pattern(call: ServiceCall) -> None:
+        """Play a pattern on the targeted shockers."""
+        steps = compile_pattern(call.data[ATTR_STEPS])
+        for entry, shocker_ids in async_resolve_shockers(hass, call).items():
+            entry.runtime_data.patterns.play(shocker_ids, steps)
+
+    hass.services.async_register(DOMAIN, SERVICE_CONTROL, async_control, CONTROL_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EMERGENCY_STOP,
+        async_emergency_stop_service,
+        EMERGENCY_STOP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PLAY_PATTERN, async_play_pattern, PLAY_PATTERN_SCHEMA
+    )
+
+
+async def _async_control_entry(
+    entry: OpenShockConfigEntry,
+    shocker_ids: list[str],
+    call: ServiceCall,
+) -> None:
+    """
+    Send one command to shockers of an entry in a single request.
+
+    An omitted intensity or duration is taken from the number entities of each
+    shocker.
+    """
+    command = call.data[ATTR_TYPE]
+    intensity = call.data.get(ATTR_INTENSITY)
+    duration = call.data.get(ATTR_DURATION)
+    if command == "stop":
+        await async_emergency_stop(entry, shocker_ids)
+        return
+    coordinators = entry.runtime_data.coordinators
+    shocks = []
+    for shocker_id in shocker_ids:
+        settings = coordinators[shocker_id].settings.command(command)
+        shocks.append(
+            {
+                "id": shocker_id,
+                "type": command,
+                "intensity": intensity if intensity is not None else settings.intensity,
+                "duration": duration if duration is not None else settings.duration,
+                "exclusive": True,
+            }
+        )
+    try:
+        await entry.runtime_data.client.control_shockers(shocks)
+    except OpenShockApiClientError as exception:
+        raise HomeAssistantError(exception) from exception
+    entry.runtime_data.coordinator.async_note_activity()
+
+
+async def async_emergency_stop(
+    entry: OpenShockConfigEntry,
+    shocker_ids: list[str],
+) -> tuple[float, float | None]:
+    """
+    Stop shockers of an entry ahead of everything else.
+
+    Returns how long the stop took and how long until its resend after the
+    commands in flight was done, None without a resend.
+    """
+    entry.runtime_data.patterns.cancel(shocker_ids)
+    try:
+        stopped, resent = await entry.runtime_data.client.emergency_stop(shocker_ids)
+    except OpenShockApiClientError as exception:
+        LOGGER.error("Emergency stop of %s failed - %s", entry.title, exception)
+        raise HomeAssistantError(exception) from exception
+    LOGGER.debug(
+        "Emergency stop of %s shockers of %s completed in %.0f ms, resent in %s",
+        len(shocker_ids),
+        entry.title,
+        stopped * 1000,
+        "-" if resent is None else f"{resent * 1000:.0f} ms",
+    )
+    entry.runtime_data.coordinator.async_note_activity()
+    return stopped, resent
+
+
+def async_resolve_shockers(
+    hass: HomeAssistant,
+    call: ServiceCall,
+) -> dict[OpenShockConfigEntry, list[str]]:
+    """
+    Return the ids of the targeted shockers grouped by their config entry.
+
+    Targeting a hub or an account targets all of its shockers.
+    """
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        if (
+            entity := entity_registry.async_get(entity_id)
+        ) is not None and entity.device_id is not None:
+            device_ids.add(entity.device_id)
+    identifiers = {
+        identifier
+        for device_id in device_ids
+        if (device := device_registry.async_get(device_id)) is not None
+        for domain, identifier in device.identifiers
+        if domain == DOMAIN
+    }
+
+    shockers: dict[OpenShockConfigEntry, list[str]] = {}
+    entry: OpenShockConfigEntry
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        shocker_ids = [
+            shocker_id
+            for shocker_id, coordinator in entry.runtime_data.coordinators.items()
+            if identifiers & {shocker_id, coordinator.hub.id, entry.entry_id}
+        ]
+        if shocker_ids:
+            shockers[entry] = shocker_ids
+    if not shockers:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="no_shockers",
+        )
+    return shockers